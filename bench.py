@@ -0,0 +1,433 @@
+"""
+Offline benchmark of the client against a local stand-in server.
+
+The server serves fixture payloads of realistic size (synthetic ones by
+default, or recorded ones from `--fixtures DIR`, named `<method>.json`) and
+the client is run in sync, threaded and async modes, with the `requests`
+transport and the `httpx` one (HTTPXTransport, if installed). For each
+endpoint, transport and mode, the requests/s, p50/p99 latency, mean decode
+time, bytes on the wire per response and the peak memory of a run of
+`--workers` requests (concurrent ones in the threaded and async modes) are
+reported. The server compresses with the best encoding accepted by the
+client (zstd and brotli need `zstandard` and `brotli`).
+
+    python bench.py [--requests 50] [--workers 8] [--modes sync,threaded,async]
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import random
+import socket
+import statistics
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from coinmarketcapapi import CoinMarketCapAPI, HTTPXTransport
+
+try:
+    from coinmarketcapapi.aio import AsyncCoinMarketCapAPI
+    import aiohttp  # noqa: F401
+except ImportError:
+    AsyncCoinMarketCapAPI = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+TIMESTAMP = '2024-01-01T00:00:00.000Z'
+
+# Benchmarked method: (endpoint path without version, call arguments).
+ENDPOINTS = {
+    'cryptocurrency_listings_latest': (
+        '/cryptocurrency/listings/latest', {'limit': 5000}),
+    'cryptocurrency_ohlcv_historical': (
+        '/cryptocurrency/ohlcv/historical',
+        {'id': 1, 'time_start': '2000-01-01', 'count': 10000}),
+    'cryptocurrency_marketpairs_latest': (
+        '/cryptocurrency/market-pairs/latest', {'id': 1, 'limit': 5000}),
+    'globalmetrics_quotes_latest': (
+        '/global-metrics/quotes/latest', {}),
+}
+
+
+def _status(credit_count=1):
+    return {'timestamp': TIMESTAMP, 'error_code': 0, 'error_message': None,
+            'elapsed': 10, 'credit_count': credit_count, 'notice': None}
+
+
+def fixture_listings(rows=5000, rng=random):
+    data = []
+    for i in range(1, rows + 1):
+        price = rng.uniform(0.0001, 50000)
+        supply = rng.uniform(1e6, 1e10)
+        data.append({
+            'id': i, 'name': 'Coin {}'.format(i), 'symbol': 'C{}'.format(i),
+            'slug': 'coin-{}'.format(i),
+            'num_market_pairs': rng.randint(1, 10000),
+            'date_added': '2013-04-28T00:00:00.000Z',
+            'tags': ['mineable', 'pow', 'store-of-value'],
+            'max_supply': None, 'circulating_supply': supply,
+            'total_supply': supply, 'infinite_supply': False,
+            'platform': None, 'cmc_rank': i,
+            'self_reported_circulating_supply': None,
+            'self_reported_market_cap': None, 'tvl_ratio': None,
+            'last_updated': TIMESTAMP,
+            'quote': {'USD': {
+                'price': price, 'volume_24h': rng.uniform(0, 1e10),
+                'volume_change_24h': rng.uniform(-50, 50),
+                'percent_change_1h': rng.uniform(-5, 5),
+                'percent_change_24h': rng.uniform(-20, 20),
+                'percent_change_7d': rng.uniform(-40, 40),
+                'percent_change_30d': rng.uniform(-60, 60),
+                'percent_change_60d': rng.uniform(-80, 80),
+                'percent_change_90d': rng.uniform(-90, 90),
+                'market_cap': price * supply,
+                'market_cap_dominance': rng.uniform(0, 50),
+                'fully_diluted_market_cap': price * supply,
+                'tvl': None, 'last_updated': TIMESTAMP,
+            }},
+        })
+    return {'status': _status(25), 'data': data}
+
+
+def fixture_ohlcv(points=10000, rng=random):
+    quotes = []
+    start = 1262304000
+    price = 100.
+    for i in range(points):
+        day = time.strftime('%Y-%m-%dT%H:%M:%S.000Z',
+                            time.gmtime(start + i * 86400))
+        close = price * rng.uniform(.95, 1.05)
+        quotes.append({
+            'time_open': day, 'time_close': day, 'time_high': day,
+            'time_low': day,
+            'quote': {'USD': {
+                'open': price, 'high': max(price, close) * 1.01,
+                'low': min(price, close) * .99, 'close': close,
+                'volume': rng.uniform(1e6, 1e10),
+                'market_cap': close * 19e6, 'timestamp': day,
+            }},
+        })
+        price = close
+    return {'status': _status(100), 'data': {'1': {
+        'id': 1, 'name': 'Bitcoin', 'symbol': 'BTC', 'quotes': quotes}}}
+
+
+def fixture_marketpairs(pairs=5000, rng=random):
+    market_pairs = []
+    for i in range(pairs):
+        price = rng.uniform(40000, 60000)
+        market_pairs.append({
+            'exchange': {'id': i % 500, 'name': 'Exchange {}'.format(i % 500),
+                         'slug': 'exchange-{}'.format(i % 500)},
+            'outlier_detected': 0, 'exclusions': None,
+            'market_id': i, 'market_pair': 'BTC/Q{}'.format(i),
+            'category': 'spot', 'fee_type': 'percentage',
+            'market_pair_base': {
+                'currency_id': 1, 'currency_symbol': 'BTC',
+                'exchange_symbol': 'BTC', 'currency_type': 'cryptocurrency'},
+            'market_pair_quote': {
+                'currency_id': 825 + i, 'currency_symbol': 'Q{}'.format(i),
+                'exchange_symbol': 'Q{}'.format(i),
+                'currency_type': 'cryptocurrency'},
+            'quote': {
+                'exchange_reported': {
+                    'price': price, 'volume_24h_base': rng.uniform(0, 1e4),
+                    'volume_24h_quote': rng.uniform(0, 1e8),
+                    'last_updated': TIMESTAMP},
+                'USD': {
+                    'price': price, 'volume_24h': rng.uniform(0, 1e8),
+                    'depth_negative_two': rng.uniform(0, 1e6),
+                    'depth_positive_two': rng.uniform(0, 1e6),
+                    'last_updated': TIMESTAMP},
+            },
+        })
+    return {'status': _status(50), 'data': {
+        'id': 1, 'name': 'Bitcoin', 'symbol': 'BTC',
+        'num_market_pairs': pairs, 'market_pairs': market_pairs}}
+
+
+def fixture_globalmetrics(rng=random):
+    return {'status': _status(1), 'data': {
+        'active_cryptocurrencies': 9000, 'total_cryptocurrencies': 30000,
+        'active_market_pairs': 80000, 'active_exchanges': 700,
+        'btc_dominance': rng.uniform(40, 60),
+        'eth_dominance': rng.uniform(10, 20),
+        'last_updated': TIMESTAMP,
+        'quote': {'USD': {'total_market_cap': 2e12, 'total_volume_24h': 8e10,
+                          'last_updated': TIMESTAMP}},
+    }}
+
+
+def encode(body):
+    """
+      The `body` in each available content encoding, best one first.
+    """
+    encodings = {}
+    if zstandard is not None:
+        encodings['zstd'] = zstandard.ZstdCompressor(level=3).compress(body)
+    if brotli is not None:
+        encodings['br'] = brotli.compress(body, quality=5)
+    encodings['gzip'] = gzip.compress(body, 6)
+    encodings['identity'] = body
+    return encodings
+
+
+def build_fixtures(fixtures_dir=None, seed=42):
+    """
+      Payloads by endpoint path (without version), in each available content
+      encoding.
+    """
+    rng = random.Random(seed)
+    payloads = {
+        'cryptocurrency_listings_latest': lambda: fixture_listings(rng=rng),
+        'cryptocurrency_ohlcv_historical': lambda: fixture_ohlcv(rng=rng),
+        'cryptocurrency_marketpairs_latest':
+            lambda: fixture_marketpairs(rng=rng),
+        'globalmetrics_quotes_latest': lambda: fixture_globalmetrics(rng=rng),
+    }
+    fixtures = {}
+    for method, (path, _) in ENDPOINTS.items():
+        recorded = fixtures_dir and os.path.join(
+            fixtures_dir, '{}.json'.format(method))
+        if recorded and os.path.exists(recorded):
+            with open(recorded, 'rb') as fd:
+                body = fd.read()
+        else:
+            body = json.dumps(payloads[method]()).encode('utf-8')
+        fixtures[path] = encode(body)
+    return fixtures
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """
+        Serve the fixture of the requested endpoint (any API version),
+        compressed with the best accepted encoding, over keep-alive
+        connections. Body bytes sent are counted in `bytes_sent`.
+    """
+
+    protocol_version = 'HTTP/1.1'
+    fixtures = {}
+    bytes_sent = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        # Headers and body are written separately: avoid delayed ACKs.
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        path = '/' + self.path.split('?', 1)[0].split('/', 2)[-1]
+        fixture = self.fixtures.get(path, None)
+        if fixture is None:
+            self.send_error(404)
+            return
+        accepted = [encoding.strip() for encoding in
+                    self.headers.get('Accept-Encoding', '').split(',')]
+        encoding = next((encoding for encoding in fixture
+                         if encoding in accepted), 'identity')
+        body = fixture[encoding]
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        if encoding != 'identity':
+            self.send_header('Content-Encoding', encoding)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        with self.lock:
+            StandInHandler.bytes_sent += len(body)
+
+
+def start_server(fixtures):
+    StandInHandler.fixtures = fixtures
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, 'http://127.0.0.1:{}/'.format(server.server_port)
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def timed_call(cmc, method, params):
+    start = time.perf_counter()
+    rep = getattr(cmc, method)(**params)
+    fetched = time.perf_counter()
+    rep.data
+    return fetched - start, time.perf_counter() - fetched
+
+
+def run_sync(base_url, method, params, requests, workers, transport):
+    cmc = CoinMarketCapAPI('bench', base_url=base_url, keep_raw=False,
+                           transport=transport)
+    return [timed_call(cmc, method, params) for _ in range(requests)]
+
+
+def run_threaded(base_url, method, params, requests, workers, transport):
+    cmc = CoinMarketCapAPI('bench', base_url=base_url, keep_raw=False,
+                           thread_safe=True, pool_maxsize=workers,
+                           transport=transport)
+    with ThreadPoolExecutor(workers) as executor:
+        return list(executor.map(
+            lambda _: timed_call(cmc, method, params), range(requests)))
+
+
+def run_async(base_url, method, params, requests, workers, transport):
+    async def call(cmc, semaphore):
+        async with semaphore:
+            start = time.perf_counter()
+            rep = await getattr(cmc, method)(**params)
+            fetched = time.perf_counter()
+            rep.data
+            return fetched - start, time.perf_counter() - fetched
+
+    async def main():
+        semaphore = asyncio.Semaphore(workers)
+        async with AsyncCoinMarketCapAPI('bench', base_url=base_url,
+                                         keep_raw=False,
+                                         transport=transport) as cmc:
+            try:
+                return await asyncio.gather(
+                    *[call(cmc, semaphore) for _ in range(requests)])
+            finally:
+                if transport is not None:
+                    await transport.aclose()
+
+    return asyncio.run(main())
+
+
+MODES = {'sync': run_sync, 'threaded': run_threaded, 'async': run_async}
+# Transport of the client by name, built for a number of workers (None is
+# the default RequestsTransport).
+TRANSPORTS = {
+    'requests': lambda workers: None,
+    'httpx': lambda workers: HTTPXTransport(
+        max_connections=workers, max_keepalive_connections=workers),
+}
+
+
+def peak_memory(base_url, method, params, mode, workers, transport):
+    """
+      Peak memory (bytes) allocated by a `mode` run of `workers` requests,
+      traced apart from the timed run (tracing slows allocations down).
+    """
+    tracemalloc.start()
+    try:
+        MODES[mode](base_url, method, params, workers, workers, transport)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def benchmark(base_url, fixtures, modes, endpoints, requests, workers,
+              transports=('requests',)):
+    results = []
+    for method in endpoints:
+        path, params = ENDPOINTS[method]
+        for transport in transports:
+            for mode in modes:
+                memory = peak_memory(base_url, method, params, mode, workers,
+                                     TRANSPORTS[transport](workers))
+                sent = StandInHandler.bytes_sent
+                start = time.perf_counter()
+                timings = MODES[mode](base_url, method, params, requests,
+                                      workers, TRANSPORTS[transport](workers))
+                wall = time.perf_counter() - start
+                latencies = [fetch for fetch, _ in timings]
+                results.append({
+                    'endpoint': method,
+                    'transport': transport,
+                    'mode': mode,
+                    'payload_bytes': len(fixtures[path]['identity']),
+                    'wire_bytes': (StandInHandler.bytes_sent - sent) /
+                    requests,
+                    'requests_per_second': requests / wall,
+                    'p50_ms': percentile(latencies, .5) * 1000,
+                    'p99_ms': percentile(latencies, .99) * 1000,
+                    'decode_ms': statistics.mean(
+                        decode for _, decode in timings) * 1000,
+                    'peak_memory_bytes': memory,
+                })
+    return results
+
+
+def print_results(results):
+    header = '{:<34} {:<8} {:<8} {:>7} {:>8} {:>8} {:>9} {:>10} {:>9} {:>8}'
+    row = '{:<34} {:<8} {:<8} {:>7.0f} {:>8.1f} {:>8.1f} {:>9.1f} ' \
+        '{:>10.1f} {:>9.1f} {:>8.1f}'
+    print(header.format('endpoint', 'transp.', 'mode', 'req/s', 'p50 ms',
+                        'p99 ms', 'decode ms', 'payload KB', 'wire KB',
+                        'peak MB'))
+    for result in results:
+        print(row.format(
+            result['endpoint'], result['transport'], result['mode'],
+            result['requests_per_second'], result['p50_ms'],
+            result['p99_ms'], result['decode_ms'],
+            result['payload_bytes'] / 1024, result['wire_bytes'] / 1024,
+            result['peak_memory_bytes'] / 1024 / 1024))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--requests', type=int, default=50,
+                        help='requests per endpoint and mode (default 50)')
+    parser.add_argument('--workers', type=int, default=8,
+                        help='concurrency of the threaded and async modes')
+    parser.add_argument('--modes', default=','.join(MODES),
+                        help='comma-separated modes (default: all)')
+    parser.add_argument('--endpoints', default=','.join(ENDPOINTS),
+                        help='comma-separated methods (default: all)')
+    parser.add_argument('--transports', default=','.join(TRANSPORTS),
+                        help='comma-separated transports (default: all)')
+    parser.add_argument('--fixtures', default=None,
+                        help='directory of recorded `<method>.json` payloads')
+    parser.add_argument('--json', default=None,
+                        help='also write the results to this JSON file')
+    args = parser.parse_args()
+
+    modes = args.modes.split(',')
+    if 'async' in modes and AsyncCoinMarketCapAPI is None:
+        print('aiohttp is not installed: skipping the async mode.')
+        modes.remove('async')
+    transports = args.transports.split(',')
+    if 'httpx' in transports and httpx is None:
+        print('httpx is not installed: skipping the httpx transport.')
+        transports.remove('httpx')
+
+    fixtures = build_fixtures(args.fixtures)
+    server, base_url = start_server(fixtures)
+    try:
+        results = benchmark(base_url, fixtures, modes,
+                            args.endpoints.split(','), args.requests,
+                            args.workers, transports)
+    finally:
+        server.shutdown()
+    print_results(results)
+    if args.json:
+        with open(args.json, 'w') as fd:
+            json.dump(results, fd, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -23,13 +23,27 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import functools
 import logging
 from logging.config import dictConfig
 import time
+from concurrent.futures import ThreadPoolExecutor
 
-from requests import Request, Session
 from requests.exceptions import ConnectionError, Timeout, TooManyRedirects
-import json
+
+from .cache import BaseCache, MemoryCache, DiskCache, Revalidator, \
+    make_key, endpoint_ttl, normalize_params
+from .columnar import payload_columns
+from .jsonlib import loads as json_loads, extract_status, set_json_decoder, \
+    data_digest
+from .keypool import KeyPool
+from .metrics import Metrics, StatsdSink
+from .ratelimit import RateLimiter, parse_retry_after
+from .retry import RetryPolicy
+from .singleflight import SingleFlight, AsyncSingleFlight
+from .streaming import StreamingResponse, iter_payload
+from .transport import BaseTransport, RequestsTransport, RecordingTransport, \
+    ReplayTransport, ReplayMissError, HTTPXTransport
 
 __version__ = VERSION = "0.6"
 SANDBOX_API_KEY = 'b54bcf4d-1bca-4e8e-9a24-22ff2c3d462c'
@@ -58,18 +72,19 @@ class APITimer(object):
     """
         APITimer
 
-        Just a simple timer to know how long the request took.
+        Just a simple timer to know how long the request took (monotonic
+        clock).
     """
 
     def __init__(self):
-        self.__t = time.time()
+        self.__t = time.perf_counter()
 
     def reset(self):
-        self.__t = time.time()
+        self.__t = time.perf_counter()
 
     @property
     def elapsed(self):
-        return time.time() - self.__t
+        return time.perf_counter() - self.__t
 
 
 class Response(object):
@@ -108,42 +123,141 @@ class Response(object):
             property will give details about error.
         - error (bool): True if an error has been raised.
 
+        Set by the client:
+        - attempts (int): the number of attempts (see RetryPolicy).
+        - retry_wait (float): the total time in seconds spent waiting between
+            attempts.
+        - digest (str | None): digest of `data` (see `max_stale`).
+
+        The payload is decoded lazily: the status properties only decode the
+        leading `status` object of the body, `data` is decoded on first
+        access (timed, and passed in seconds to `on_decode` if set). With
+        `keep_raw=False` the `requests.Response` (`_req`) is not kept, only
+        the body and the HTTP `status_code`.
+
     """
 
-    def __init__(self, resp, timer):
+    __slots__ = ('_req', 'status_code', 'attempts', 'retry_wait', 'digest',
+                 '__content', '__payload', '__status', '__time_snap',
+                 '__on_decode')
+
+    def __init__(self, resp, timer, keep_raw=True, on_decode=None):
+        self._req = resp if keep_raw else None
+        self.status_code = resp.status_code
+        self.attempts = 1
+        self.retry_wait = 0.
+        self.digest = None
+        self.__content = resp.content
+        self.__payload = None
+        self.__status = None
+        self.__time_snap = timer.elapsed
+        self.__on_decode = on_decode
+
+    def __parse(self):
+        """
+          Decode the whole payload (on first access to `data`).
+        """
+        if self.__payload is not None:
+            return self.__payload
+        start = time.perf_counter()
         try:
-            # Normal behaviour handle (Response is valid JSON).
-            self.__payload = json.loads(resp.text)
-        except json.decoder.JSONDecodeError as decode_error:
+            # Normal behaviour handle (Response is valid JSON), parsed
+            # straight from the raw bytes.
+            payload = json_loads(self.__content)
+        except ValueError as decode_error:
             # Decoding Error handle.
-            self.__payload = {
+            text = self.__content.decode('utf-8', 'replace')
+            payload = {
                 'message':
-                f'Local error, expecting a valid JSON, got:\t\n"{resp.text}"',
+                f'Local error, expecting a valid JSON, got:\t\n"{text}"',
                 'error': True,
                 'statusCode': '999 [LOCAL_JSON_DECODE_ERROR]',
             }
-        self.__timer = timer
-        self._req = resp
-        self._message = self.__payload.get('message', None)
-        self._error = self.__payload.get('error', None)
-        self._statusCode = self.__payload.get('statusCode', None)
-        if self._message and self._error and self._statusCode:
-            self.status = {
-                'error_code': self._statusCode,
-                'error_message': self._message,
-            }
-        else:
-            self.status = self.__payload.get('status', {})
-
-        self.data = self.__payload.get('data', {})
-        self.timesamp = self.status.get('timestamp', None)
-        self.error_code = self.status.get('error_code', None)
-        self.error_message = self.status.get('error_message', None)
-        self.error = True if self.error_code and self.error_message else False
-        self.ok = False if self.error else True
-        self.elapsed = self.status.get('elapsed', None)
-        self.credit_count = self.status.get('credit_count', None)
-        self.__time_snap = timer.elapsed
+        if not isinstance(payload, dict):
+            payload = {}
+        self.__payload = payload
+        self.__status = None
+        self.__content = None
+        if self.__on_decode is not None:
+            on_decode, self.__on_decode = self.__on_decode, None
+            on_decode(time.perf_counter() - start)
+        return payload
+
+    @property
+    def _message(self):
+        return self.__parse().get('message', None)
+
+    @property
+    def _error(self):
+        return self.__parse().get('error', None)
+
+    @property
+    def _statusCode(self):
+        return self.__parse().get('statusCode', None)
+
+    @property
+    def data(self):
+        return self.__parse().get('data', {})
+
+    @property
+    def status(self):
+        if self.__status is None:
+            if self.__payload is None:
+                # Cheap path: only decode the leading `status` object.
+                self.__status = extract_status(self.__content)
+            if self.__status is None:
+                if self._message and self._error and self._statusCode:
+                    self.__status = {
+                        'error_code': self._statusCode,
+                        'error_message': self._message,
+                    }
+                else:
+                    self.__status = self.__parse().get('status', {})
+        return self.__status
+
+    @property
+    def timesamp(self):
+        return self.status.get('timestamp', None)
+
+    @property
+    def error_code(self):
+        return self.status.get('error_code', None)
+
+    @property
+    def error_message(self):
+        return self.status.get('error_message', None)
+
+    @property
+    def error(self):
+        return True if self.error_code and self.error_message else False
+
+    @property
+    def ok(self):
+        return not self.error
+
+    @property
+    def elapsed(self):
+        return self.status.get('elapsed', None)
+
+    @property
+    def credit_count(self):
+        return self.status.get('credit_count', None)
+
+    @property
+    def content(self):
+        """
+          Raw body (bytes), None once `data` has been decoded.
+        """
+        return self.__content
+
+    def to_columns(self, fields=None, use_numpy=None):
+        """
+          Column-oriented view of `data` (listings, quotes, OHLCV...): a dict
+          of NumPy arrays (or `array.array`) by dotted field path, eg.
+          'quote.USD.price', with timestamps as int unix timestamps.
+          See `coinmarketcapapi.columnar.to_columns()`.
+        """
+        return payload_columns(self.data, fields, use_numpy)
 
     @property
     def total_elapsed(self):
@@ -192,21 +306,99 @@ class CoinMarketCapAPIError(Exception):
         self.rep = r
 
 
+class RateLimitError(CoinMarketCapAPIError):
+    """
+        RateLimitError
+
+        Raised (without sending the request) when the client-side rate
+        limiter sheds a request: the request could not get a slot within
+        `max_wait` seconds, or a credit budget is exhausted. The `rep`
+        property is None.
+    """
+
+    def __init__(self, message):
+        Exception.__init__(self, message)
+        self.rep = None
+
+
+def _bind_calls(cmc, calls):
+    """
+      Resolve the `calls` of `gather()` (method names or (method, kwargs)
+      tuples) to a list of (bound method, kwargs).
+    """
+    bound = []
+    for call in calls:
+        if isinstance(call, str):
+            method, kwargs = call, {}
+        else:
+            method, kwargs = call
+        bound.append((getattr(cmc, method), dict(kwargs or {})))
+    return bound
+
+
 class CoinMarketCapAPI(object):
     """
         CoinMarketCapAPI
 
         Main API wrapper to instanciate. Use with or without API key (Pro
-        or Sandbox environment).
+        or Sandbox environment). `api_key` may also be a list of keys or a
+        KeyPool, to spread the requests over several keys.
+
+        Every endpoint method accepts an `api_key` keyword argument, to send
+        this request with another key, and a `stream` keyword argument:
+        `stream=True` returns a StreamingResponse, its records being decoded
+        while the body is downloaded (not cached nor coalesced).
 
         Some keyword arguments are available:
         - `debug`: (bool) activate the debug mode
             (show request, response, time elapsed).
         - `logger`: (logging.Logger) use to pass a custom logger.
+        - `base_url`: (str) root URL of the API, eg. a local stand-in server
+            (default: the Pro or Sandbox API).
+        - `cache`: (bool | BaseCache) cache successful responses, `True` for
+            an in-memory LRU cache or any cache backend instance (see
+            `MemoryCache` and `DiskCache`).
+        - `cache_ttl`: (dict) override the default time-to-live (seconds)
+            by endpoint path or suffix, eg. `{'/latest': 30}`.
+        - `max_stale`: (float) stale-while-revalidate: expired cached
+            responses are still returned for `max_stale` seconds while a
+            background request refreshes them (one per request at a time).
+            A refreshed response with the same `data` as the stale one (see
+            `jsonlib.data_digest()`) is dropped and the stale Response,
+            maybe already decoded, is cached again.
+        - `rate_limit`: (bool | RateLimiter) throttle requests on the client
+            side, `True` for the basic plan limit (30 requests per minute).
+        - `retry`: (bool | RetryPolicy) retry requests failing with a 429,
+            5xx or network error, `True` for the default RetryPolicy.
+        - `keep_raw`: (bool) keep the `requests.Response` in the `_req`
+            property of responses (default True), set to False to save
+            memory when caching many responses.
+        - `coalesce`: (bool) identical concurrent requests (same URL,
+            version, parameters and pinned `api_key`) share a single HTTP
+            request and Response.
+        - `metrics`: (bool | Metrics) collect per-endpoint metrics (phase
+            latencies, payload sizes, credits, cache hits, retries and
+            errors), `True` for a new Metrics instance.
+
+        Connection pool keyword arguments:
+        - `pool_connections`: (int) number of host pools to cache
+            (default 10).
+        - `pool_maxsize`: (int) maximum number of connections kept per host
+            (default 10), set it to the number of threads using the instance.
+        - `pool_block`: (bool) block when no connection is available instead
+            of opening a connection not kept in the pool (default False).
+        - `keep_alive`: (bool) reuse connections (default True).
+        - `timeout`: (float | tuple) connect and read timeout in seconds, as
+            in `requests` (default None).
+        - `thread_safe`: (bool) use one Session per thread, sharing the same
+            connection pool, so an instance can safely be shared by threads.
+        - `transport`: (BaseTransport) HTTP layer to use instead of the
+            default RequestsTransport built from the arguments above, eg. an
+            HTTPXTransport (HTTP/2), a RecordingTransport or a
+            ReplayTransport.
     """
 
     def __init__(self, api_key=None, **kwargs):
-        self.__session = Session()
         self.__logger = kwargs.get('logger', None)
         self.__debug = kwargs.get('debug', False)
 
@@ -216,6 +408,13 @@ class CoinMarketCapAPI(object):
 
         self.__version = kwargs.get('version', 'v1')
 
+        self.__key_pool = None
+        if isinstance(api_key, (list, tuple)):
+            api_key = KeyPool(api_key)
+        if isinstance(api_key, KeyPool):
+            self.__key_pool = api_key
+            api_key = api_key.keys[0]
+
         if api_key is None:
             self.__sandbox = True
             self.__key = SANDBOX_API_KEY
@@ -227,47 +426,412 @@ class CoinMarketCapAPI(object):
             self.__base_url = 'https://sandbox-api.coinmarketcap.com/'
         else:
             self.__base_url = 'https://pro-api.coinmarketcap.com/'
+        if kwargs.get('base_url', None) is not None:
+            self.__base_url = kwargs['base_url'].rstrip('/') + '/'
 
         self.__headers = {
             'Accepts': 'application/json',
             'Accept-Encoding': 'deflate, gzip',
             'X-CMC_PRO_API_KEY': self.__key
         }
+        if not kwargs.get('keep_alive', True):
+            self.__headers['Connection'] = 'close'
+        self.__key_headers = {}
+        for key in self.__key_pool.keys if self.__key_pool else ():
+            self.__key_headers[key] = self.__key_request_headers(key)
+
+        # Headers are set once here and never mutated afterwards.
+        self.__timeout = kwargs.get('timeout', None)
+        self.__transport = kwargs.get('transport', None)
+        if self.__transport is None:
+            self.__transport = RequestsTransport(
+                pool_connections=kwargs.get('pool_connections', 10),
+                pool_maxsize=kwargs.get('pool_maxsize', 10),
+                pool_block=kwargs.get('pool_block', False),
+                thread_safe=kwargs.get('thread_safe', False))
+
+        self.__cache = kwargs.get('cache', None)
+        if self.__cache is True:
+            self.__cache = MemoryCache()
+        elif self.__cache is False:
+            self.__cache = None
+        self.__cache_ttl = kwargs.get('cache_ttl', None)
+        self.__max_stale = kwargs.get('max_stale', 0)
+        self.__revalidator = None
+        if self.__cache is not None and self.__max_stale:
+            self.__revalidator = Revalidator(self.__revalidate_error)
+
+        self.__rate_limiter = kwargs.get('rate_limit', None)
+        if self.__rate_limiter is True:
+            self.__rate_limiter = RateLimiter()
+        elif self.__rate_limiter is False:
+            self.__rate_limiter = None
+
+        self.__keep_raw = kwargs.get('keep_raw', True)
+
+        self.__single_flight = None
+        if kwargs.get('coalesce', False):
+            self.__single_flight = SingleFlight()
+
+        self.__retry = kwargs.get('retry', None)
+        if self.__retry is True:
+            self.__retry = RetryPolicy()
+        elif self.__retry is False:
+            self.__retry = None
+
+        self.__metrics = kwargs.get('metrics', None)
+        if self.__metrics is True:
+            self.__metrics = Metrics()
+        elif self.__metrics is False:
+            self.__metrics = None
 
-    def __get(self, url, **kwargs):
-        timer = APITimer()
+    @property
+    def rate_limiter(self):
+        """
+          The RateLimiter of this instance (or None).
+        """
+        return self.__rate_limiter
+
+    @property
+    def key_pool(self):
+        """
+          The KeyPool of this instance (or None).
+        """
+        return self.__key_pool
+
+    @property
+    def transport(self):
+        """
+          The transport (HTTP layer) of this instance.
+        """
+        return self.__transport
 
+    @property
+    def metrics(self):
+        """
+          The Metrics of this instance (or None).
+        """
+        return self.__metrics
+
+    def gather(self, calls, max_workers=10, return_exceptions=True):
+        """
+          Send several endpoint calls concurrently, in at most `max_workers`
+          threads sharing the connection pool (use `thread_safe=True` and a
+          `pool_maxsize` of at least `max_workers`). `calls` is a list of
+          method names or (method, kwargs) tuples.
+
+          Returns the Responses in the order of `calls`. The exception of a
+          failed call takes the place of its Response, or is raised if
+          `return_exceptions` is False.
+
+          ```
+              glob, fng, exchanges = cmc.gather([
+                  'globalmetrics_quotes_latest',
+                  'fearandgreed_latest',
+                  ('exchange_listings_latest', {'limit': 50}),
+              ])
+          ```
+        """
+        calls = _bind_calls(self, calls)
+
+        def send(call):
+            method, kwargs = call
+            try:
+                return method(**kwargs)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                return e
+
+        if max_workers > 1 and len(calls) > 1:
+            with ThreadPoolExecutor(
+                    max_workers=min(max_workers, len(calls))) as executor:
+                return list(executor.map(send, calls))
+        return [send(call) for call in calls]
+
+    def _prepare_request(self, url, kwargs):
+        """
+          Prepare an endpoint call: log it, resolve the API version and look
+          up the cache. Returns a dict describing the call, its `response`
+          item holds the cached Response on a cache hit.
+        """
         if self.__debug and self.__logger is not None:
             self.__logger.debug('GET {} {}\nPARAMETERS: {}'.format(
                 'SANDBOX' if self.__sandbox else 'PRO',
                 repr(url), repr(kwargs)))
 
-        self.__session.headers.update(self.__headers)
         version = kwargs.pop('api_version', self.__version)
-        url = '{}{}{}'.format(self.__base_url, version, url)
-
-        try:
-            response = self.__session.get(url, params=kwargs)
-            rep = Response(response, timer)
-            if self.__debug:
-                self.__logger.debug(rep)
+        api_key = kwargs.pop('api_key', None)
+        stream = kwargs.pop('stream', False)
+        call = {
+            'path': url,
+            'version': version,
+            'url': '{}{}{}'.format(self.__base_url, version, url),
+            # Normalized query string parameters, as in the cache key.
+            'params': normalize_params(kwargs),
+            'headers': self.__headers,
+            'key_pool': self.__key_pool,
+            'api_key': None,
+            'key': make_key(self.__base_url, version, url, kwargs),
+            # Key of coalesced calls (see `coalesce`).
+            'flight_key': None,
+            'cache_key': None,
+            'ttl': 0,
+            'rate_limiter': self.__rate_limiter,
+            'attempts': 1,
+            'delay': None,
+            'retry_wait': 0.,
+            'timings': {},
+            'stream': stream,
+            'stale': None,
+            'response': None,
+        }
+        call['flight_key'] = call['key']
+        if api_key is not None:
+            # Pinned key: not taken from the key pool, and not coalesced
+            # with calls sent with other keys (eg. `key_info`).
+            call['headers'] = self.__key_request_headers(api_key)
+            call['key_pool'] = None
+            call['flight_key'] = call['key'] + (api_key,)
+
+        if self.__cache is not None and not stream:
+            call['ttl'] = endpoint_ttl(url, self.__cache_ttl)
+            if call['ttl'] > 0:
+                call['cache_key'] = call['key']
+                if self.__revalidator is not None:
+                    rep, fresh = self.__cache.get_stale(call['cache_key'])
+                    if rep is not None and not fresh:
+                        # Returned as is, and refreshed in the background.
+                        call['stale'] = rep
+                else:
+                    rep = self.__cache.get(call['cache_key'])
+                if self.__metrics is not None:
+                    self.__metrics.cache(url, rep is not None,
+                                         call['stale'] is not None)
+                if rep is not None:
+                    if self.__debug:
+                        self.__logger.debug('{} HIT {}'.format(
+                            'STALE' if call['stale'] else 'CACHE', rep))
+                    call['response'] = rep
+        return call
+
+    def _handle_response(self, call, response, timer):
+        """
+          Build the Response of an HTTP response, raise CoinMarketCapAPIError
+          on error or store it in cache.
+        """
+        if call['stream']:
+            rep = StreamingResponse(response, timer)
+        elif self.__metrics is not None:
+            # `data` is decoded lazily, its decoding is recorded then.
+            rep = Response(response, timer, self.__keep_raw, functools.partial(
+                self.__metrics.observe, 'decode', call['path']))
+        else:
+            rep = Response(response, timer, self.__keep_raw)
+        rep.attempts = call['attempts']
+        rep.retry_wait = call['retry_wait']
+        if self.__metrics is not None:
+            call['timings']['total'] = timer.elapsed
+            # The size of a streamed body is unknown until it is read.
+            size = None if call['stream'] else len(response.content)
+            self.__metrics.response(
+                call['path'], response.status_code, size,
+                rep.credit_count, call['timings'])
             if rep.error:
-                if rep.error_code == 401 and \
-                    "API Key is invalid" in rep.error_message and \
-                        self.__debug and self.__logger is None:
+                self.__metrics.error(call['path'], str(rep.error_code))
+        if self.__debug:
+            self.__logger.debug(rep)
+        if self.__rate_limiter is not None:
+            self.__rate_limiter.record(rep.credit_count)
+            if response.status_code == 429:
+                self.__rate_limiter.throttled(
+                    parse_retry_after(response.headers.get('Retry-After')))
+        if call['api_key'] is not None:
+            key_pool = call['key_pool']
+            key_pool.record(call['api_key'], rep.credit_count)
+            if response.status_code == 429:
+                key_pool.throttled(call['api_key'], parse_retry_after(
+                    response.headers.get('Retry-After')))
+            elif response.status_code == 401:
+                key_pool.unauthorized(call['api_key'])
+        if rep.error:
+            if rep.error_code == 401 and \
+                "API Key is invalid" in rep.error_message and \
+                    self.__debug and self.__logger is None:
+
+                ak = 'sandbox-api' if self.__sandbox else 'pro-api'
+                self.__logger.warning(
+                    'Be sure you are using a {} key or set `sandbox={}`'
+                    .format(ak, not self.__sandbox) +
+                    ' to CoinMarketCapAPI, see issue #1.')
+
+            if call['stream']:
+                rep.close()
+            raise CoinMarketCapAPIError(rep)
+        if call['cache_key'] is not None:
+            if self.__revalidator is not None:
+                rep = self.__revalidated(call, rep, response)
+                self.__cache.set(call['cache_key'], rep, call['ttl'],
+                                 self.__max_stale)
+            else:
+                self.__cache.set(call['cache_key'], rep, call['ttl'])
+        return rep
+
+    def __revalidated(self, call, rep, response):
+        """
+          Response to cache for `call`: `rep`, or the stale Response it
+          refreshes if `data` is unchanged.
+        """
+        rep.digest = data_digest(response.content)
+        stale = call['stale']
+        if stale is None:
+            return rep
+        unchanged = getattr(stale, 'digest', None) == rep.digest
+        if self.__metrics is not None:
+            self.__metrics.increment('revalidations', call['path'],
+                                     'unchanged' if unchanged else 'changed')
+        return stale if unchanged else rep
+
+    def _revalidate(self, call, refresh):
+        """
+          Refresh the stale cached Response of `call` in the background with
+          `refresh()` (a function, or a coroutine function).
+        """
+        self.__revalidator.spawn(call['key'], refresh)
+
+    def __revalidate_error(self, key, error):
+        path = key[2]
+        if self.__metrics is not None:
+            self.__metrics.increment('revalidations', path, 'error')
+        if self.__logger is not None:
+            self.__logger.warning('Revalidation of {} failed: {}'.format(
+                path, error))
+
+    def _handle_network_error(self, error, call=None):
+        if self.__metrics is not None and call is not None:
+            self.__metrics.error(call['path'], type(error).__name__)
+        if self.__logger is not None:
+            self.__logger.warning(error)
+
+    def _retry_delay(self, call, response=None, error=None):
+        """
+          Delay in seconds before retrying a failed call (with an error
+          `response` or a network `error`), None to give up.
+        """
+        if response is not None and response.status_code in (401, 429) \
+                and call['api_key'] is not None and \
+                call['attempts'] < len(call['key_pool']):
+            # The key was benched: the pool picks another key, or waits for
+            # the end of the shortest bench.
+            call['attempts'] += 1
+            return 0.
+        if self.__retry is None:
+            return None
+        status_code = retry_after = None
+        if response is not None:
+            status_code = response.status_code
+            retry_after = parse_retry_after(
+                response.headers.get('Retry-After'))
+        delay = self.__retry.next_delay(
+            call['path'], call['attempts'], call['delay'],
+            call['retry_wait'], status_code, error, retry_after)
+        if delay is not None:
+            if self.__metrics is not None:
+                reason = type(error).__name__ if error is not None \
+                    else str(status_code)
+                self.__metrics.retry(call['path'], reason)
+            if self.__debug:
+                self.__logger.debug('RETRY {} in {:.2f}s (attempt {})'.format(
+                    call['path'], delay, call['attempts'] + 1))
+            call['attempts'] += 1
+            call['delay'] = delay
+            call['retry_wait'] += delay
+        return delay
+
+    def _reserve_key(self, call):
+        """
+          Pick the key of the pool to send `call` with. Returns the seconds
+          to wait before sending it, raises a RateLimitError if no key is
+          available.
+        """
+        reservation = call['key_pool'].reserve()
+        if reservation is None:
+            raise self._rate_limit_error(call)
+        call['api_key'], wait = reservation
+        call['headers'] = self.__key_headers[call['api_key']]
+        return wait
+
+    def __key_request_headers(self, key):
+        headers = dict(self.__headers)
+        headers['X-CMC_PRO_API_KEY'] = key
+        return headers
+
+    def _rate_limit_error(self, call):
+        if self.__metrics is not None:
+            self.__metrics.error(call['path'], 'shed')
+        return RateLimitError(
+            'Request to {} shed by the client-side rate limiter.'
+            .format(call['path']))
 
-                    ak = 'sandbox-api' if self.__sandbox else 'pro-api'
-                    self.__logger.warning(
-                        'Be sure you are using a {} key or set `sandbox={}`'
-                        .format(ak, not self.__sandbox) +
-                        ' to CoinMarketCapAPI, see issue #1.')
+    def __get(self, url, **kwargs):
+        timer = APITimer()
+        call = self._prepare_request(url, kwargs)
+        if call['response'] is not None:
+            if call['stale'] is not None:
+                self._revalidate(
+                    call, lambda: self.__send(call, APITimer()))
+            return call['response']
+        if self.__single_flight is not None and not call['stream']:
+            return self.__single_flight.do(
+                call['flight_key'], lambda: self.__send(call, timer))
+        return self.__send(call, timer)
+
+    def __send(self, call, timer):
+        while True:
+            limiter = call['rate_limiter']
+            start = time.perf_counter()
+            if limiter is not None and not limiter.acquire():
+                raise self._rate_limit_error(call)
+            if call['key_pool'] is not None:
+                wait = self._reserve_key(call)
+                if wait > 0:
+                    time.sleep(wait)
+
+            timings = call['timings']
+            try:
+                sent = time.perf_counter()
+                timings['wait'] = timings.get('wait', 0.) + sent - start
+                if call['stream']:
+                    response = self.__transport.send(
+                        call['url'], call['params'], call['headers'],
+                        self.__timeout, stream=True)
+                else:
+                    response = self.__transport.send(
+                        call['url'], call['params'], call['headers'],
+                        self.__timeout)
+                # `requests` measures the time to the response headers
+                # (connection included), the body is read afterwards.
+                timings['ttfb'] = response.elapsed.total_seconds()
+                timings['download'] = max(
+                    0., time.perf_counter() - sent - timings['ttfb'])
+            except (ConnectionError, Timeout) as e:
+                delay = self._retry_delay(call, error=e)
+                if delay is None:
+                    self._handle_network_error(e, call)
+                    raise e
+                time.sleep(delay)
+                continue
+            except TooManyRedirects as e:
+                self._handle_network_error(e, call)
+                raise e
 
-                raise CoinMarketCapAPIError(rep)
-            return rep
-        except (ConnectionError, Timeout, TooManyRedirects) as e:
-            if self.__logger is not None:
-                self.__logger.warning(e)
-            raise e
+            try:
+                return self._handle_response(call, response, timer)
+            except CoinMarketCapAPIError:
+                delay = self._retry_delay(call, response=response)
+                if delay is None:
+                    raise
+                time.sleep(delay)
 
     def cryptocurrency_map(self, **kwargs):
         """
@@ -0,0 +1,225 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# MIT License
+#
+# Copyright (c) 2019-2025 Remi SARRAZIN
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import asyncio
+import time
+
+from requests.exceptions import ConnectionError, Timeout
+
+from . import APITimer, CoinMarketCapAPI, CoinMarketCapAPIError, _bind_calls
+from .singleflight import AsyncSingleFlight
+from .cache import query_string
+from .transport import build_http_response
+
+try:
+    import aiohttp
+    import yarl
+except ImportError:
+    aiohttp = None
+
+
+def _client_timeout(timeout):
+    """
+      aiohttp timeout of a `requests` style timeout: (connect, read) or a
+      single value for both, None for no timeout.
+    """
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+    else:
+        connect = read = timeout
+    return aiohttp.ClientTimeout(total=None, sock_connect=connect,
+                                 sock_read=read)
+
+
+class AsyncCoinMarketCapAPI(CoinMarketCapAPI):
+    """
+        AsyncCoinMarketCapAPI
+
+        Asyncio version of CoinMarketCapAPI (requires `aiohttp`). It takes
+        the same arguments and exposes the same methods, which return
+        awaitables resolving to `Response` instances (or raising
+        `CoinMarketCapAPIError`).
+
+        ```
+            async with AsyncCoinMarketCapAPI(api_key) as cmc:
+                btc, eth = await asyncio.gather(
+                    cmc.cryptocurrency_info(symbol='BTC'),
+                    cmc.cryptocurrency_info(symbol='ETH'))
+        ```
+
+        Some additional keyword arguments are available:
+        - `limit`: (int) maximum number of simultaneous connections
+            (default 100).
+        - `limit_per_host`: (int) maximum number of simultaneous connections
+            to the API host (default 0, no limit other than `limit`).
+        - `timeout`: (float | tuple) connect and read timeout in seconds,
+            as in the synchronous client (default None): a (connect, read)
+            tuple, or a single value for both.
+        - `transport`: (BaseTransport) send requests with its `asend()`
+            instead of aiohttp, eg. a ReplayTransport.
+    """
+
+    def __init__(self, api_key=None, **kwargs):
+        if aiohttp is None:
+            raise ImportError(
+                'AsyncCoinMarketCapAPI requires `aiohttp`'
+                ' (install via `pip install aiohttp`).')
+        super(AsyncCoinMarketCapAPI, self).__init__(api_key, **kwargs)
+        self.__limit = kwargs.get('limit', 100)
+        self.__limit_per_host = kwargs.get('limit_per_host', 0)
+        self.__timeout = kwargs.get('timeout', None)
+        self.__session = None
+        self.__transport = kwargs.get('transport', None)
+        self.__single_flight = None
+        if kwargs.get('coalesce', False):
+            self.__single_flight = AsyncSingleFlight()
+
+    def __get_session(self):
+        if self.__session is None or self.__session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.__limit, limit_per_host=self.__limit_per_host)
+            self.__session = aiohttp.ClientSession(
+                connector=connector, timeout=_client_timeout(self.__timeout))
+        return self.__session
+
+    async def __aget(self, url, **kwargs):
+        timer = APITimer()
+        call = self._prepare_request(url, kwargs)
+        if call['response'] is not None:
+            if call['stale'] is not None:
+                async def refresh():
+                    return await self.__send(call, APITimer())
+                self._revalidate(call, refresh)
+            return call['response']
+        if self.__single_flight is not None and not call['stream']:
+            return await self.__single_flight.do(
+                call['flight_key'], lambda: self.__send(call, timer))
+        return await self.__send(call, timer)
+
+    async def __fetch(self, session, call):
+        timings = call['timings']
+        url = call['url']
+        if call['params']:
+            # Same query string as the synchronous client.
+            url = yarl.URL('{}?{}'.format(url, query_string(call['params'])),
+                           encoded=True)
+        sent = time.perf_counter()
+        async with session.get(url, headers=call['headers']) as resp:
+            headers_received = time.perf_counter()
+            timings['ttfb'] = headers_received - sent
+            content = await resp.read()
+            timings['download'] = time.perf_counter() - headers_received
+            return build_http_response(
+                resp.status, content, resp.headers, str(resp.url),
+                resp.reason, resp.charset)
+
+    async def __send(self, call, timer):
+        session = None
+        if self.__transport is None:
+            session = self.__get_session()
+        while True:
+            limiter = call['rate_limiter']
+            start = time.perf_counter()
+            if limiter is not None and not await limiter.aacquire():
+                raise self._rate_limit_error(call)
+            if call['key_pool'] is not None:
+                wait = self._reserve_key(call)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+
+            timings = call['timings']
+            error = cause = None
+            try:
+                sent = time.perf_counter()
+                timings['wait'] = timings.get('wait', 0.) + sent - start
+                if self.__transport is not None:
+                    response = await self.__transport.asend(
+                        call['url'], call['params'], call['headers'],
+                        self.__timeout)
+                    # As in the synchronous client: the transport measures
+                    # the time to the response headers.
+                    timings['ttfb'] = response.elapsed.total_seconds()
+                    timings['download'] = max(
+                        0., time.perf_counter() - sent - timings['ttfb'])
+                else:
+                    response = await self.__fetch(session, call)
+            except (ConnectionError, Timeout) as e:
+                error = e
+            except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+                if isinstance(e, asyncio.TimeoutError):
+                    error = Timeout(e)
+                else:
+                    error = ConnectionError(e)
+                cause = e
+            if error is not None:
+                delay = self._retry_delay(call, error=error)
+                if delay is None:
+                    self._handle_network_error(error, call)
+                    raise error from cause
+                await asyncio.sleep(delay)
+                continue
+
+            try:
+                return self._handle_response(call, response, timer)
+            except CoinMarketCapAPIError:
+                delay = self._retry_delay(call, response=response)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+
+    async def gather(self, calls, max_concurrency=10, return_exceptions=True):
+        """
+          Asyncio version of `CoinMarketCapAPI.gather()`, at most
+          `max_concurrency` calls are sent at the same time.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def send(method, kwargs):
+            async with semaphore:
+                return await method(**kwargs)
+
+        return await asyncio.gather(
+            *[send(method, kwargs) for method, kwargs in
+              _bind_calls(self, calls)],
+            return_exceptions=return_exceptions)
+
+    # Every wrapper method of CoinMarketCapAPI ends with `self.__get(...)`:
+    # overriding the (mangled) name makes all of them return coroutines.
+    def _CoinMarketCapAPI__get(self, url, **kwargs):
+        return self.__aget(url, **kwargs)
+
+    async def close(self):
+        """
+          Close the underlying connection pool.
+        """
+        if self.__session is not None:
+            await self.__session.close()
+            self.__session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
@@ -0,0 +1,214 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# MIT License
+#
+# Copyright (c) 2019-2025 Remi SARRAZIN
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import json
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .cache import normalize_params
+from .timeutils import interval_seconds, to_timestamp
+
+# Maximum number of interval periods returned by a historical call.
+MAX_POINTS = 10000
+
+
+def series_records(data):
+    """
+      Map each asset id (str) of a historical `data` payload to its list of
+      quotes. Handles both the single asset (v1) and the keyed (v2) forms.
+    """
+    if 'quotes' in data:
+        return {str(data.get('id')): data['quotes']}
+    series = {}
+    for key, value in data.items():
+        if isinstance(value, list):
+            # Symbol keyed responses: one entry per matching asset.
+            for asset in value:
+                series[str(asset.get('id', key))] = asset.get('quotes', [])
+        else:
+            series[str(value.get('id', key))] = value.get('quotes', [])
+    return series
+
+
+def record_time(record):
+    """
+      Timestamp (int) of a quote or OHLCV record.
+    """
+    return to_timestamp(record.get('time_open') or record.get('timestamp'))
+
+
+class Backfill(object):
+    """
+        Backfill
+
+        Fetch the historical series of many assets over a long time range
+        with `cryptocurrency_ohlcv_historical` (default) or
+        `cryptocurrency_quotes_historical`:
+        - (ids x time range) is split into windows of at most `max_points`
+            intervals and `ids_per_call` assets,
+        - windows are fetched concurrently by `max_workers` threads (the
+            RateLimiter of `cmc`, if any, keeps them within the plan limits),
+        - with a `checkpoint` path, each fetched window is appended to a
+            JSON lines file, and windows found in it are not fetched again
+            after an interruption. Entries record the request (`method`,
+            `interval` and other parameters): those of another request are
+            ignored.
+
+        Iterating over a Backfill yields `(id, records)` tuples, the records
+        of each asset being de-duplicated and sorted by time.
+
+        ```
+            backfill = Backfill(cmc, [1, 1027], '2018-01-01', '2025-01-01',
+                                interval='daily', checkpoint='ohlcv.jsonl')
+            for asset_id, records in backfill:
+                ...
+        ```
+
+        Other keyword arguments (eg. `convert`) are passed to each call.
+    """
+
+    def __init__(self, cmc, ids, time_start, time_end, interval='daily',
+                 method='cryptocurrency_ohlcv_historical',
+                 max_points=MAX_POINTS, ids_per_call=1, max_workers=4,
+                 checkpoint=None, **kwargs):
+        self.cmc = cmc
+        self.ids = [str(i) for i in ids]
+        self.time_start = to_timestamp(time_start)
+        self.time_end = to_timestamp(time_end)
+        self.interval = interval
+        self.method = method
+        self.max_points = max_points
+        self.ids_per_call = ids_per_call
+        self.max_workers = max_workers
+        self.checkpoint = checkpoint
+        self.params = kwargs
+        self.__lock = threading.Lock()
+
+    def windows(self):
+        """
+          List of the (ids, time_start, time_end) windows to fetch, `ids`
+          being a comma-separated string.
+        """
+        span = interval_seconds(self.interval) * self.max_points
+        windows = []
+        for i in range(0, len(self.ids), self.ids_per_call):
+            ids = ','.join(self.ids[i:i + self.ids_per_call])
+            start = self.time_start
+            while start < self.time_end:
+                end = min(start + span, self.time_end)
+                windows.append((ids, start, end))
+                start = end
+        return windows
+
+    @property
+    def request(self):
+        """
+          The request of the windows, as stored in checkpoint entries.
+        """
+        return {
+            'method': self.method,
+            'interval': self.interval,
+            'params': dict(normalize_params(self.params)),
+        }
+
+    def __load_checkpoint(self):
+        done = {}
+        if not self.checkpoint or not os.path.exists(self.checkpoint):
+            return done
+        request = self.request
+        with open(self.checkpoint, 'r') as fd:
+            for line in fd:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Truncated last line of an interrupted run.
+                    continue
+                if entry.get('request') != request:
+                    # Window of another request sharing the checkpoint.
+                    continue
+                done[tuple(entry['window'])] = entry['series']
+        return done
+
+    def __save_checkpoint(self, window, series):
+        if not self.checkpoint:
+            return
+        entry = json.dumps({
+            'request': self.request, 'window': window, 'series': series})
+        with self.__lock:
+            with open(self.checkpoint, 'a') as fd:
+                fd.write(entry)
+                fd.write('\n')
+
+    def __fetch(self, window):
+        ids, start, end = window
+        rep = getattr(self.cmc, self.method)(
+            id=ids, time_start=start, time_end=end, interval=self.interval,
+            **self.params)
+        return series_records(rep.data)
+
+    def __merge(self, records):
+        merged = {}
+        for record in records:
+            merged[record_time(record)] = record
+        return [merged[t] for t in sorted(merged)]
+
+    def __iter__(self):
+        windows = self.windows()
+        done = self.__load_checkpoint()
+        outstanding = {}
+        for ids, _, _ in windows:
+            outstanding[ids] = outstanding.get(ids, 0) + 1
+        collected = {}
+
+        def add(window, series):
+            for asset_id, records in series.items():
+                collected.setdefault(asset_id, []).extend(records)
+            outstanding[window[0]] -= 1
+            if outstanding[window[0]] == 0:
+                for asset_id in window[0].split(','):
+                    yield asset_id, self.__merge(collected.pop(asset_id, []))
+
+        def complete(in_flight):
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                window = in_flight.pop(future)
+                series = future.result()
+                self.__save_checkpoint(window, series)
+                yield from add(window, series)
+
+        # Windows are submitted in order with a bounded number in flight, so
+        # assets complete roughly in order and little data is held at once.
+        in_flight = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for window in windows:
+                if window in done:
+                    yield from add(window, done.pop(window))
+                    continue
+                while len(in_flight) >= 2 * self.max_workers:
+                    yield from complete(in_flight)
+                in_flight[executor.submit(self.__fetch, window)] = window
+            while in_flight:
+                yield from complete(in_flight)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# MIT License
+#
+# Copyright (c) 2019-2025 Remi SARRAZIN
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+# Quotes and info endpoints bill 1 credit per 100 returned assets: chunks
+# are multiples of CREDIT_UNIT so no credit is wasted on partial units.
+CREDIT_UNIT = 100
+MAX_IDS = 1000
+MAX_LENGTH = 4000
+
+
+def chunk_ids(ids, max_ids=MAX_IDS, max_length=MAX_LENGTH,
+              credit_unit=CREDIT_UNIT):
+    """
+      Split `ids` (any iterable of ids, symbols or slugs) into
+      comma-separated strings of at most `max_ids` items and `max_length`
+      characters. Duplicates are removed. When a chunk is cut by the length
+      limit, it is shrunk to a multiple of `credit_unit` items (if possible).
+    """
+    chunks = []
+    chunk = []
+    length = -1
+    seen = set()
+    for item in ids:
+        item = str(item).strip()
+        if not item or item in seen:
+            continue
+        seen.add(item)
+        if chunk and (len(chunk) >= max_ids or
+                      length + len(item) + 1 > max_length):
+            if len(chunk) < max_ids and len(chunk) > credit_unit:
+                keep = len(chunk) - len(chunk) % credit_unit
+                chunk, carry = chunk[:keep], chunk[keep:]
+            else:
+                carry = []
+            chunks.append(','.join(chunk))
+            chunk = carry
+            length = len(','.join(chunk)) if chunk else -1
+        chunk.append(item)
+        length += len(item) + 1
+    if chunk:
+        chunks.append(','.join(chunk))
+    return chunks
+
+
+def _merge(responses):
+    data = {}
+    for rep in responses:
+        data.update(rep.data)
+    return data
+
+
+def batch_call(cmc, method, ids, key='id', max_workers=1,
+               max_ids=MAX_IDS, max_length=MAX_LENGTH, **kwargs):
+    """
+      Call `method` (eg. 'cryptocurrency_quotes_latest') of the
+      CoinMarketCapAPI instance `cmc` for all `ids`, passed as the `key`
+      parameter ('id', 'symbol' or 'slug') in as few requests as possible,
+      then return the merged `data` dicts. With `max_workers` > 1 chunks are
+      fetched in parallel threads. Other keyword arguments are passed to each
+      call.
+
+      ```
+          data = batch_call(cmc, 'cryptocurrency_quotes_latest',
+                            range(1, 5001), max_workers=4, convert='EUR')
+      ```
+    """
+    bound_method = getattr(cmc, method)
+    chunks = chunk_ids(ids, max_ids, max_length)
+
+    def fetch(chunk):
+        params = dict(kwargs)
+        params[key] = chunk
+        return bound_method(**params)
+
+    if max_workers > 1 and len(chunks) > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            responses = list(executor.map(fetch, chunks))
+    else:
+        responses = [fetch(chunk) for chunk in chunks]
+    return _merge(responses)
+
+
+async def abatch_call(cmc, method, ids, key='id', max_concurrency=4,
+                      max_ids=MAX_IDS, max_length=MAX_LENGTH, **kwargs):
+    """
+      Asyncio version of `batch_call()` for AsyncCoinMarketCapAPI, at most
+      `max_concurrency` chunks are fetched at the same time.
+    """
+    bound_method = getattr(cmc, method)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch(chunk):
+        params = dict(kwargs)
+        params[key] = chunk
+        async with semaphore:
+            return await bound_method(**params)
+
+    chunks = chunk_ids(ids, max_ids, max_length)
+    responses = await asyncio.gather(*[fetch(chunk) for chunk in chunks])
+    return _merge(responses)
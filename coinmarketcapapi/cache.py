@@ -0,0 +1,390 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# MIT License
+#
+# Copyright (c) 2019-2025 Remi SARRAZIN
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlencode
+
+# Default time-to-live (seconds) by endpoint suffix, first match wins.
+# A TTL of 0 disables caching for the matching endpoints.
+DEFAULT_TTLS = (
+    ('/key/info', 0),
+    ('/map', 3600),
+    ('/info', 3600),
+    ('/historical', 3600),
+    ('/latest', 60),
+)
+DEFAULT_TTL = 60
+
+
+def normalize_params(params):
+    """
+      Normalize request parameters (a dict, or (name, value) pairs) into a
+      hashable, order independent tuple of (name, value) pairs. Lists and
+      tuples are joined with commas (as expected by the API) and booleans
+      are lowered, so `aux=['a', 'b']` and `aux='a,b'` share the same key.
+      Clients send this tuple as the query string, so the cache key always
+      matches the request sent.
+    """
+    items = []
+    if isinstance(params, dict):
+        params = params.items()
+    for name, value in params:
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            value = 'true' if value else 'false'
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            value = ','.join(str(v) for v in value)
+        else:
+            value = str(value)
+        items.append((name, value))
+    return tuple(sorted(items))
+
+
+def query_string(params):
+    """
+      Encoded query string of request parameters (see `normalize_params()`),
+      as sent by `requests`.
+    """
+    return urlencode(normalize_params(params))
+
+
+def make_key(base_url, version, path, params):
+    """
+      Build the cache key of a request.
+    """
+    return (base_url, version, path, normalize_params(params))
+
+
+def endpoint_ttl(path, overrides=None):
+    """
+      Time-to-live of the given endpoint `path` (eg. '/cryptocurrency/map').
+      `overrides` is an optional dict mapping an endpoint path (exact match)
+      or a suffix (eg. '/latest') to a TTL in seconds.
+    """
+    if overrides:
+        if path in overrides:
+            return overrides[path]
+        for suffix, ttl in overrides.items():
+            if path.endswith(suffix):
+                return ttl
+    for suffix, ttl in DEFAULT_TTLS:
+        if path.endswith(suffix):
+            return ttl
+    return DEFAULT_TTL
+
+
+def _response_content(rep):
+    """
+      Raw body of a Response, encoded again from `status` and `data` once
+      the body has been decoded (and dropped).
+    """
+    content = rep.content
+    if content is None:
+        content = json.dumps({'status': rep.status, 'data': rep.data},
+                             separators=(',', ':')).encode('utf-8')
+    return content
+
+
+def _build_response(status_code, content, digest=None):
+    """
+      Response of a stored body (see DiskCache), without `_req`.
+    """
+    from . import APITimer, Response
+    from .transport import build_http_response
+    rep = Response(build_http_response(status_code, content), APITimer(),
+                   keep_raw=False)
+    rep.digest = digest
+    return rep
+
+
+def _mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return 0
+
+
+class BaseCache(object):
+    """
+        BaseCache
+
+        Interface of a response cache backend. A backend stores `Response`
+        instances under keys built by `make_key()` for `ttl` seconds.
+        Backends must be thread-safe.
+
+        Backends supporting stale-while-revalidate keep expired entries
+        `stale` more seconds and return them with `get_stale()`.
+    """
+
+    def get(self, key):
+        """
+          Return the cached value or None if missing or expired.
+        """
+        raise NotImplementedError
+
+    def get_stale(self, key):
+        """
+          Return a tuple (value, fresh): the cached value, even expired
+          within its `stale` delay (`fresh` is then False), or None.
+        """
+        return self.get(key), True
+
+    def set(self, key, value, ttl, stale=0):
+        """
+          Store `value` under `key` for `ttl` seconds, then `stale` seconds
+          as a stale entry.
+        """
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class MemoryCache(BaseCache):
+    """
+        MemoryCache
+
+        In-process cache with a bounded number of entries, the least recently
+        used entry is evicted when `maxsize` is reached.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get(self, key):
+        value, fresh = self.get_stale(key)
+        return value if fresh else None
+
+    def get_stale(self, key):
+        with self.__lock:
+            entry = self.__entries.get(key, None)
+            if entry is None:
+                return None, False
+            expires, stale_until, value = entry
+            now = time.time()
+            if stale_until <= now:
+                del self.__entries[key]
+                return None, False
+            self.__entries.move_to_end(key)
+            return value, expires > now
+
+    def set(self, key, value, ttl, stale=0):
+        with self.__lock:
+            expires = time.time() + ttl
+            self.__entries[key] = (expires, expires + stale, value)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.maxsize:
+                self.__entries.popitem(last=False)
+
+    def delete(self, key):
+        with self.__lock:
+            self.__entries.pop(key, None)
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+
+    def __len__(self):
+        return len(self.__entries)
+
+
+class DiskCache(BaseCache):
+    """
+        DiskCache
+
+        On-disk cache, one file per entry in `directory`, so cached
+        responses survive restarts and may be shared between processes.
+        When more than `maxsize` entries are stored, the least recently used
+        files (by modification time) are removed.
+
+        Only plain data is written: a JSON header (key, expiry dates, HTTP
+        status code and digest) followed by the raw body. The Response is
+        rebuilt on read, so the request (and its API key header) is never
+        stored, and nothing is unpickled from the directory.
+    """
+
+    def __init__(self, directory, maxsize=4096):
+        self.directory = directory
+        self.maxsize = maxsize
+        self.__lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def __path(self, key):
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, digest + '.cache')
+
+    def __files(self):
+        return [os.path.join(self.directory, name)
+                for name in os.listdir(self.directory)
+                if name.endswith('.cache')]
+
+    def get(self, key):
+        value, fresh = self.get_stale(key)
+        return value if fresh else None
+
+    def get_stale(self, key):
+        path = self.__path(key)
+        try:
+            with open(path, 'rb') as fd:
+                header = json.loads(fd.readline())
+                content = fd.read()
+            stored_key = header['key']
+            expires = header['expires']
+            stale_until = header['stale_until']
+        except (OSError, ValueError, TypeError, KeyError):
+            return None, False
+        if stored_key != repr(key):
+            return None, False
+        now = time.time()
+        if stale_until <= now:
+            self.delete(key)
+            return None, False
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return _build_response(header.get('status_code', 200), content,
+                               header.get('digest')), expires > now
+
+    def set(self, key, value, ttl, stale=0):
+        path = self.__path(key)
+        tmp_path = '{}.{}.tmp'.format(path, threading.get_ident())
+        expires = time.time() + ttl
+        header = json.dumps({
+            'key': repr(key),
+            'expires': expires,
+            'stale_until': expires + stale,
+            'status_code': value.status_code,
+            'digest': getattr(value, 'digest', None),
+        })
+        with self.__lock:
+            with open(tmp_path, 'wb') as fd:
+                fd.write(header.encode('utf-8') + b'\n')
+                fd.write(_response_content(value))
+            os.replace(tmp_path, path)
+            self.__evict()
+
+    def __evict(self):
+        files = self.__files()
+        if len(files) <= self.maxsize:
+            return
+        files.sort(key=_mtime)
+        for path in files[:len(files) - self.maxsize]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def delete(self, key):
+        try:
+            os.remove(self.__path(key))
+        except OSError:
+            pass
+
+    def clear(self):
+        with self.__lock:
+            for path in self.__files():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def __len__(self):
+        return len(self.__files())
+
+
+class Revalidator(object):
+    """
+        Revalidator
+
+        Run the background refreshes of stale cache entries, at most one at
+        a time per key: in a daemon thread, or in a task of the running
+        event loop for coroutine functions. Exceptions of the refreshes are
+        passed to `on_error(key, exception)`.
+    """
+
+    def __init__(self, on_error=None):
+        self.on_error = on_error
+        self.__lock = threading.Lock()
+        self.__keys = set()
+        self.__tasks = set()
+
+    def spawn(self, key, function):
+        """
+          Run `function()` in the background, unless a refresh of `key` is
+          already running. Returns True if it was started.
+        """
+        with self.__lock:
+            if key in self.__keys:
+                return False
+            self.__keys.add(key)
+        if asyncio.iscoroutinefunction(function):
+            task = asyncio.ensure_future(self.__arun(key, function))
+            # The event loop only keeps weak references to tasks.
+            self.__tasks.add(task)
+            task.add_done_callback(self.__tasks.discard)
+        else:
+            threading.Thread(target=self.__run, args=(key, function),
+                             daemon=True).start()
+        return True
+
+    def __error(self, key, error):
+        if self.on_error is not None:
+            self.on_error(key, error)
+
+    def __release(self, key):
+        with self.__lock:
+            self.__keys.discard(key)
+
+    def __run(self, key, function):
+        try:
+            function()
+        except Exception as e:
+            self.__error(key, e)
+        finally:
+            self.__release(key)
+
+    async def __arun(self, key, function):
+        try:
+            await function()
+        except Exception as e:
+            self.__error(key, e)
+        finally:
+            self.__release(key)
+
+    def __len__(self):
+        return len(self.__keys)
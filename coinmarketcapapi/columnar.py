@@ -0,0 +1,223 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# MIT License
+#
+# Copyright (c) 2019-2025 Remi SARRAZIN
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import re
+from array import array
+
+from .timeutils import to_timestamp
+
+# Imported on first use (see `_numpy()`), so importing the package does
+# not load NumPy.
+numpy = False
+
+_TIMESTAMP_RE = re.compile(r'^\d{4}-\d\d-\d\d[T ]\d\d:\d\d')
+_INTEGER_FIELDS = ('id', 'cmc_rank', 'rank', 'num_market_pairs')
+_SAMPLE_SIZE = 10
+NAN = float('nan')
+MISSING_INT = -1
+
+
+def _numpy():
+    """
+      The `numpy` module, imported on first call, or None if not installed.
+    """
+    global numpy
+    if numpy is False:
+        try:
+            import numpy as module
+        except ImportError:
+            module = None
+        numpy = module
+    return numpy
+
+
+def _use_numpy(use_numpy):
+    """
+      Resolve the `use_numpy` argument: None uses NumPy if installed, True
+      requires it.
+    """
+    if use_numpy is None:
+        return _numpy() is not None
+    if use_numpy and _numpy() is None:
+        raise ImportError('use_numpy=True requires NumPy (install via'
+                          ' `pip install numpy`).')
+    return use_numpy
+
+
+def _timestamp(value):
+    """
+      Unix timestamp of a timestamp string, MISSING_INT if it is not one.
+    """
+    try:
+        return to_timestamp(value)
+    except ValueError:
+        return MISSING_INT
+
+
+def payload_records(data):
+    """
+      Records of a `data` payload, as a tuple (records, asset ids):
+      - listings and maps: the `data` list,
+      - market pairs: the `market_pairs` list,
+      - historical quotes / OHLCV: the `quotes` of all the assets, asset ids
+          giving the asset id of each quote,
+      - latest quotes, info...: the values of the `data` dict.
+      Asset ids is None except for historical payloads.
+    """
+    if isinstance(data, list):
+        return data, None
+    if not isinstance(data, dict):
+        return [], None
+    if 'market_pairs' in data:
+        return data['market_pairs'], None
+    if 'quotes' in data:
+        assets = [data]
+    else:
+        assets = []
+        for value in data.values():
+            if isinstance(value, list):
+                assets.extend(value)
+            elif isinstance(value, dict):
+                assets.append(value)
+    if assets and all('quotes' in asset for asset in assets):
+        records = []
+        asset_ids = []
+        for asset in assets:
+            records.extend(asset['quotes'])
+            asset_ids.extend([asset.get('id')] * len(asset['quotes']))
+        return records, asset_ids
+    return assets, None
+
+
+def _leaf_fields(record, prefix=''):
+    fields = []
+    for key, value in record.items():
+        if isinstance(value, dict):
+            fields.extend(_leaf_fields(value, prefix + key + '.'))
+        elif not isinstance(value, list):
+            fields.append(prefix + key)
+    return fields
+
+
+def infer_fields(records):
+    """
+      Dotted paths (eg. 'quote.USD.price') of the scalar fields found in the
+      first records.
+    """
+    fields = {}
+    for record in records[:_SAMPLE_SIZE]:
+        for field in _leaf_fields(record):
+            fields[field] = None
+    return list(fields)
+
+
+def _column_type(name, values):
+    for value in values:
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            return 'b'
+        if isinstance(value, (int, float)):
+            if name.rsplit('.', 1)[-1] in _INTEGER_FIELDS:
+                return 'q'
+            return 'd'
+        if isinstance(value, str) and _TIMESTAMP_RE.match(value):
+            return 't'
+        return 'o'
+    return 'o'
+
+
+def to_columns(records, fields=None, use_numpy=None):
+    """
+      Convert a list of (nested) records into a dict of columns, one per
+      dotted `fields` path (default: all scalar fields, see
+      `infer_fields()`). Values are read straight from the records, without
+      building intermediate flat dicts:
+      - numbers give float64 columns (int64 for ids and ranks),
+      - timestamps strings give int64 unix timestamps, parsed once,
+      - other values give lists.
+
+      Numeric columns are NumPy arrays when NumPy is installed (and
+      `use_numpy` is not False), `array.array` otherwise. Missing numbers
+      are NaN, missing (or invalid) ids and timestamps are -1.
+    """
+    if fields is None:
+        fields = infer_fields(records)
+    use_numpy = _use_numpy(use_numpy)
+    columns = {}
+    for field in fields:
+        path = field.split('.')
+        values = []
+        for record in records:
+            value = record
+            for key in path:
+                if not isinstance(value, dict):
+                    value = None
+                    break
+                value = value.get(key, None)
+            values.append(value)
+        columns[field] = _to_column(field, values, use_numpy)
+    return columns
+
+
+def _to_column(field, values, use_numpy):
+    kind = _column_type(field, values)
+    if kind == 'd':
+        column = array('d', [
+            v if isinstance(v, (int, float)) else NAN for v in values])
+    elif kind == 'q':
+        column = array('q', [
+            int(v) if isinstance(v, (int, float)) else MISSING_INT
+            for v in values])
+    elif kind == 't':
+        column = array('q', [
+            _timestamp(v) if isinstance(v, str) else MISSING_INT
+            for v in values])
+    elif kind == 'b':
+        column = array('b', [bool(v) for v in values])
+    else:
+        return values
+    if use_numpy:
+        numpy = _numpy()
+        column = numpy.frombuffer(column, dtype={
+            'd': numpy.float64, 'q': numpy.int64, 'b': numpy.int8,
+        }[column.typecode])
+        if kind == 'b':
+            column = column.astype(bool)
+    return column
+
+
+def payload_columns(data, fields=None, use_numpy=None):
+    """
+      Columns of a `data` payload (see `payload_records()` and
+      `to_columns()`). Historical payloads get an `id` column holding the
+      asset id of each quote.
+    """
+    records, asset_ids = payload_records(data)
+    use_numpy = _use_numpy(use_numpy)
+    columns = to_columns(records, fields, use_numpy)
+    if asset_ids is not None:
+        columns['id'] = _to_column('id', asset_ids, use_numpy)
+    return columns
@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# MIT License
+#
+# Copyright (c) 2019-2025 Remi SARRAZIN
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import threading
+import time
+
+from .timeutils import to_timestamp
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def _records(data):
+    if isinstance(data, list):
+        return data
+    records = []
+    for value in data.values():
+        if isinstance(value, list):
+            records.extend(value)
+        elif isinstance(value, dict):
+            records.append(value)
+    return records
+
+
+class PriceConverter(object):
+    """
+        PriceConverter
+
+        Local replacement of `tools_priceconversion`: quotes ingested from
+        `cryptocurrency_quotes_latest` (or listings) responses are kept as
+        the value of one unit of each asset and currency in the `base`
+        currency, so any crypto/fiat pair is converted in-process through
+        cross rates.
+
+        Quotes older than `max_age` seconds (from their `last_updated`) are
+        stale: if a CoinMarketCapAPI instance `cmc` is given, the rate is then
+        fetched with `tools_priceconversion`, otherwise a KeyError is raised.
+
+        ```
+            converter = PriceConverter(cmc, max_age=120)
+            converter.ingest(cmc.cryptocurrency_quotes_latest(
+                id='1,1027', convert='USD,EUR'))
+            converter.convert(2.5, 'BTC', 'EUR')
+            converter.convert_many(numpy_array_of_amounts, 1027, 'USD')
+        ```
+
+        Assets are referenced by id (int), crypto symbol or currency code.
+    """
+
+    def __init__(self, cmc=None, max_age=300, base='USD'):
+        self.cmc = cmc
+        self.max_age = max_age
+        self.base = base
+        self.__lock = threading.Lock()
+        # Value of one unit in `base`: key -> (value, last updated).
+        self.__values = {base: (1., None)}
+        # Crypto symbol -> (cmc_rank, id), the best ranked asset wins.
+        self.__symbols = {}
+        self.__fiat_ids = {}
+
+    def ingest(self, rep):
+        """
+          Ingest the quotes of a Response (latest quotes or listings). The
+          `base` currency must be among the quoted currencies, or a currency
+          whose value is already known.
+        """
+        now = time.time()
+        with self.__lock:
+            for record in _records(rep.data):
+                self.__ingest_record(record, now)
+
+    def __ingest_record(self, record, now):
+        quote = record.get('quote', None)
+        if not quote or 'id' not in record:
+            return
+        base_price = updated = None
+        for currency, values in quote.items():
+            if not values or values.get('price', None) is None:
+                continue
+            known = self.__values.get(self.__currency_key(currency), None)
+            if known is not None:
+                base_price = values['price'] * known[0]
+                updated = to_timestamp(values.get('last_updated')) or now
+                break
+        if not base_price:
+            return
+
+        self.__values[record['id']] = (base_price, updated)
+        symbol = record.get('symbol', None)
+        if symbol:
+            rank = record.get('cmc_rank', None) or float('inf')
+            best = self.__symbols.get(symbol.upper(), None)
+            if best is None or rank <= best[0] or best[1] == record['id']:
+                self.__symbols[symbol.upper()] = (rank, record['id'])
+        # Cross rates of the other quoted currencies.
+        for currency, values in quote.items():
+            price = (values or {}).get('price', None)
+            if price:
+                self.__values[self.__currency_key(currency)] = (
+                    base_price / price,
+                    to_timestamp(values.get('last_updated')) or now)
+
+    def ingest_fiat_map(self, rep):
+        """
+          Ingest a `fiat_map` Response, so fiat currencies may be referenced
+          by id.
+        """
+        with self.__lock:
+            for record in _records(rep.data):
+                self.__fiat_ids[record['id']] = record['symbol'].upper()
+
+    def __currency_key(self, currency):
+        if isinstance(currency, str) and currency.isdigit():
+            currency = int(currency)
+        if isinstance(currency, int):
+            return self.__fiat_ids.get(currency, currency)
+        return currency.upper()
+
+    def __key(self, asset):
+        key = self.__currency_key(asset)
+        if isinstance(key, str) and key not in self.__values and \
+                key in self.__symbols:
+            return self.__symbols[key][1]
+        return key
+
+    def __value(self, asset, now):
+        value = self.__values.get(self.__key(asset), None)
+        if value is None:
+            return None
+        if value[1] is not None and now - value[1] > self.max_age:
+            return None
+        return value[0]
+
+    def rate(self, from_asset, to_asset):
+        """
+          Value of one unit of `from_asset` in `to_asset`.
+        """
+        now = time.time()
+        from_value = self.__value(from_asset, now)
+        to_value = self.__value(to_asset, now)
+        if from_value is not None and to_value:
+            return from_value / to_value
+        if self.cmc is None:
+            raise KeyError('No fresh rate for {} to {}'.format(
+                from_asset, to_asset))
+        return self.__fetch_rate(from_asset, to_asset)
+
+    def __fetch_rate(self, from_asset, to_asset):
+        params = {'amount': 1}
+        from_key = self.__key(from_asset)
+        if isinstance(from_key, int):
+            params['id'] = from_key
+        else:
+            params['symbol'] = from_key
+        to_key = self.__currency_key(to_asset)
+        if isinstance(to_key, int):
+            params['convert_id'] = to_key
+        else:
+            params['convert'] = to_key
+        data = self.cmc.tools_priceconversion(**params).data
+        if isinstance(data, list):
+            data = data[0]
+        quote = data['quote']
+        return list(quote.values())[0]['price']
+
+    def convert(self, amount, from_asset, to_asset):
+        """
+          Convert `amount` of `from_asset` into `to_asset`.
+        """
+        return amount * self.rate(from_asset, to_asset)
+
+    def convert_many(self, amounts, from_asset, to_asset):
+        """
+          Convert a sequence of amounts at once, returns a NumPy array if
+          NumPy is installed, a list otherwise.
+        """
+        rate = self.rate(from_asset, to_asset)
+        if numpy is not None:
+            return numpy.asarray(amounts, dtype=numpy.float64) * rate
+        return [amount * rate for amount in amounts]
+
+    def matrix(self, assets):
+        """
+          Rate matrix of the given assets: `matrix[i][j]` is the value of
+          one unit of `assets[i]` in `assets[j]`. A NumPy array if NumPy is
+          installed, a list of lists otherwise.
+        """
+        values = [self.rate(asset, self.base) for asset in assets]
+        if numpy is not None:
+            values = numpy.asarray(values, dtype=numpy.float64)
+            return values[:, None] / values[None, :]
+        return [[value / other for other in values] for value in values]
@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# MIT License
+#
+# Copyright (c) 2019-2025 Remi SARRAZIN
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import gzip
+import json
+import os
+import threading
+import time
+
+from .pagination import iter_records
+
+KINDS = ('cryptocurrency', 'exchange', 'fiat')
+# Records re-read before the end of the known ones on incremental refresh.
+REFRESH_OVERLAP = 100
+
+
+class _Table(object):
+    """
+        Lookup dicts of one kind of asset, rebuilt as a whole and swapped.
+    """
+
+    def __init__(self, records):
+        self.records = records
+        self.by_id = {}
+        self.by_symbol = {}
+        self.by_slug = {}
+        self.by_address = {}
+        for record in records:
+            self.by_id[record['id']] = record
+            symbol = record.get('symbol', None)
+            if symbol:
+                self.by_symbol.setdefault(symbol.upper(), []).append(record)
+            slug = record.get('slug', None)
+            if slug:
+                self.by_slug[slug] = record
+            platform = record.get('platform', None) or {}
+            address = platform.get('token_address', None)
+            if address:
+                self.by_address.setdefault(
+                    address.lower(), []).append(record)
+        for matches in self.by_symbol.values():
+            matches.sort(key=_rank)
+
+
+def _rank(record):
+    rank = record.get('rank', None)
+    return rank if rank is not None else float('inf')
+
+
+class SymbolIndex(object):
+    """
+        SymbolIndex
+
+        In-memory index of `cryptocurrency_map`, `exchange_map` and
+        `fiat_map` offering O(1) lookups by id, symbol, slug and platform
+        token address, to translate tickers into ids locally.
+
+        ```
+            index = SymbolIndex.from_snapshot('cmc-index.json.gz')
+            if index is None:
+                index = SymbolIndex()
+                index.load(cmc)
+                index.save('cmc-index.json.gz')
+            btc_id = index.id_for_symbol('BTC')
+        ```
+
+        Symbols are case insensitive and may be ambiguous: `by_symbol()`
+        returns every match, best ranked first.
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__tables = dict((kind, _Table([])) for kind in KINDS)
+        self.updated = None
+
+    def __set(self, kind, records):
+        table = _Table(sorted(records, key=lambda r: r['id']))
+        with self.__lock:
+            self.__tables[kind] = table
+            self.updated = time.time()
+
+    def load(self, cmc, kinds=KINDS, **kwargs):
+        """
+          Load the whole maps of the given `kinds` with the CoinMarketCapAPI
+          instance `cmc` (other keyword arguments are passed to each call).
+        """
+        for kind in kinds:
+            self.__set(kind, list(iter_records(
+                cmc, '{}_map'.format(kind), sort='id', **kwargs)))
+
+    def refresh(self, cmc, kinds=KINDS, **kwargs):
+        """
+          Incremental update: as ids are increasing, new assets are at the
+          end of the maps sorted by id, so only the last pages are fetched
+          (from `REFRESH_OVERLAP` records before the end of the known ones).
+          Falls back to a full load if the known records shifted too much.
+          `fiat_map` is small and always fully reloaded.
+        """
+        for kind in kinds:
+            known = self.__tables[kind]
+            if kind == 'fiat' or not known.records:
+                self.load(cmc, (kind,), **kwargs)
+                continue
+            start = max(1, len(known.records) - REFRESH_OVERLAP)
+            new_records = list(iter_records(
+                cmc, '{}_map'.format(kind), start=start, sort='id',
+                **kwargs))
+            if new_records and new_records[0]['id'] not in known.by_id:
+                self.load(cmc, (kind,), **kwargs)
+                continue
+            records = dict(known.by_id)
+            for record in new_records:
+                records[record['id']] = record
+            self.__set(kind, list(records.values()))
+
+    def by_id(self, asset_id, kind='cryptocurrency'):
+        """
+          Record of the given id, or None.
+        """
+        return self.__tables[kind].by_id.get(int(asset_id), None)
+
+    def by_symbol(self, symbol, kind='cryptocurrency'):
+        """
+          Records matching the given symbol, best ranked first.
+        """
+        return list(self.__tables[kind].by_symbol.get(symbol.upper(), ()))
+
+    def by_slug(self, slug, kind='cryptocurrency'):
+        """
+          Record of the given slug, or None.
+        """
+        return self.__tables[kind].by_slug.get(slug, None)
+
+    def by_address(self, address):
+        """
+          Cryptocurrency records of the given platform token address.
+        """
+        return list(self.__tables['cryptocurrency'].by_address.get(
+            address.lower(), ()))
+
+    def id_for_symbol(self, symbol, kind='cryptocurrency'):
+        """
+          Id of the best ranked asset with the given symbol, or None.
+        """
+        matches = self.__tables[kind].by_symbol.get(symbol.upper(), None)
+        return matches[0]['id'] if matches else None
+
+    def __len__(self):
+        return sum(len(table.records) for table in self.__tables.values())
+
+    def save(self, path):
+        """
+          Save a (gzipped if `path` ends with '.gz') JSON snapshot.
+        """
+        snapshot = {
+            'updated': self.updated,
+            'maps': dict((kind, table.records)
+                         for kind, table in self.__tables.items()),
+        }
+        opener = gzip.open if path.endswith('.gz') else open
+        tmp_path = '{}.tmp'.format(path)
+        with opener(tmp_path, 'wt') as fd:
+            json.dump(snapshot, fd)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def from_snapshot(cls, path, max_age=None):
+        """
+          Build an index from a snapshot written by `save()`, so processes
+          start warm. Returns None if the snapshot is missing, unreadable or
+          older than `max_age` seconds.
+        """
+        opener = gzip.open if path.endswith('.gz') else open
+        try:
+            with opener(path, 'rt') as fd:
+                snapshot = json.load(fd)
+        except (OSError, ValueError):
+            return None
+        updated = snapshot.get('updated', None)
+        if max_age is not None and \
+                (updated is None or time.time() - updated > max_age):
+            return None
+        index = cls()
+        for kind, records in snapshot.get('maps', {}).items():
+            if kind in KINDS:
+                index.__set(kind, records)
+        index.updated = updated
+        return index
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# MIT License
+#
+# Copyright (c) 2019-2025 Remi SARRAZIN
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import hashlib
+import json
+import re
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+DECODERS = {'json': json.loads}
+if ujson is not None:
+    DECODERS['ujson'] = ujson.loads
+if orjson is not None:
+    DECODERS['orjson'] = orjson.loads
+
+# Fastest available backend first.
+_decoder = DECODERS.get('orjson') or DECODERS.get('ujson') or json.loads
+
+_STATUS_RE = re.compile(rb'^\s*\{\s*"status"\s*:\s*')
+_STATUS_WINDOW = 1024
+
+
+def set_json_decoder(decoder):
+    """
+      Set the JSON decoder used to parse responses: 'orjson', 'ujson',
+      'json' or any callable parsing bytes. By default the fastest installed
+      backend is used. Decoders must raise a ValueError on invalid JSON.
+    """
+    global _decoder
+    if callable(decoder):
+        _decoder = decoder
+    elif decoder in DECODERS:
+        _decoder = DECODERS[decoder]
+    else:
+        raise ValueError('Unknown or not installed JSON decoder {}'.format(
+            repr(decoder)))
+
+
+def loads(content):
+    """
+      Parse JSON `content` (bytes or str) with the current decoder.
+    """
+    return _decoder(content)
+
+
+def _decode_status(content):
+    """
+      Decode the leading `status` object of `content`. Returns a tuple
+      (status, offset of its end in `content`), or (None, 0).
+    """
+    if not content:
+        return None, 0
+    match = _STATUS_RE.match(content)
+    if match is None:
+        return None, 0
+    start = match.end()
+    decoder = json.JSONDecoder()
+    size = _STATUS_WINDOW
+    while True:
+        chunk = content[start:start + size].decode('utf-8', 'ignore')
+        try:
+            status, end = decoder.raw_decode(chunk)
+        except ValueError:
+            if start + size >= len(content):
+                return None, 0
+            size *= 8
+            continue
+        if not isinstance(status, dict):
+            return None, 0
+        return status, start + len(chunk[:end].encode('utf-8'))
+
+
+def extract_status(content):
+    """
+      Decode only the `status` object of an API payload, without parsing
+      `data`. The API puts `status` first, so only the beginning of the
+      body is decoded. Returns None if it cannot be found this way.
+    """
+    return _decode_status(content)[0]
+
+
+def data_digest(content):
+    """
+      Digest of an API payload without its leading `status` object (its
+      timestamp changes on every call), so equal digests mean an unchanged
+      `data`, `last_updated` fields included. Nothing is decoded.
+    """
+    _, end = _decode_status(content)
+    return hashlib.sha1(memoryview(content)[end:]).hexdigest()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# MIT License
+#
+# Copyright (c) 2019-2025 Remi SARRAZIN
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import threading
+import time
+
+from .ratelimit import DEFAULT_REQUESTS_PER_MINUTE, RateLimiter
+
+# Seconds a key is benched after a 429 without Retry-After, and after a 401.
+THROTTLED_BENCH_TIME = 60
+UNAUTHORIZED_BENCH_TIME = 3600
+
+
+class KeyPool(object):
+    """
+        KeyPool
+
+        Pool of API keys shared by the requests of a CoinMarketCapAPI
+        instance (pass it, or a list of keys, as `api_key`). Each key has its
+        own RateLimiter (`requests_per_minute`, `daily_credits` and
+        `monthly_credits`, updated from the `credit_count` of the responses
+        and from `key_info()` with `refresh()`), so the pool throughput is
+        the sum of the keys throughputs.
+
+        Each request uses the key with the shortest wait for a slot, then
+        the most credits left, then the most requests left in the current
+        minute. Keys answering 429 are benched for the
+        `Retry-After` delay (or `THROTTLED_BENCH_TIME`), keys answering 401
+        for `UNAUTHORIZED_BENCH_TIME`. A request waiting more than
+        `max_wait` seconds for a key is shed.
+
+        ```
+            pool = KeyPool([key1, key2, key3], requests_per_minute=30)
+            cmc = CoinMarketCapAPI(pool)
+            pool.refresh(cmc)  # plan limits and usage from key_info()
+        ```
+    """
+
+    def __init__(self, keys, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE,
+                 daily_credits=None, monthly_credits=None, max_wait=60):
+        if not keys:
+            raise ValueError('KeyPool requires at least one key')
+        self.keys = list(keys)
+        self.max_wait = max_wait
+        self.__lock = threading.Lock()
+        self.__limiters = dict((key, RateLimiter(
+            requests_per_minute, daily_credits, monthly_credits,
+            max_wait=None)) for key in self.keys)
+        self.__benched = dict((key, 0.) for key in self.keys)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def limiter(self, key):
+        """
+          The RateLimiter of `key`.
+        """
+        return self.__limiters[key]
+
+    def reserve(self, credits=1):
+        """
+          Pick a key for a request expected to cost `credits` and reserve
+          a slot. Returns a tuple (key, seconds to wait before sending the
+          request), or None if the request must be shed.
+        """
+        with self.__lock:
+            now = time.monotonic()
+            best = best_score = None
+            for key in self.keys:
+                limiter = self.__limiters[key]
+                wait = limiter.estimate(credits)
+                if wait is None:
+                    continue
+                wait = max(wait, self.__benched[key] - now)
+                score = (wait, -limiter.credits_left, -limiter.headroom)
+                if best_score is None or score < best_score:
+                    best, best_score = key, score
+            if best is None or (self.max_wait is not None and
+                                best_score[0] > self.max_wait):
+                return None
+            wait = self.__limiters[best].reserve(credits)
+            if wait is None:
+                return None
+            return best, max(wait, self.__benched[best] - now, 0.)
+
+    def record(self, key, credit_count):
+        """
+          Account the credits used by a response sent with `key`.
+        """
+        self.__limiters[key].record(credit_count)
+
+    def bench(self, key, seconds):
+        """
+          Do not use `key` for the next `seconds` seconds.
+        """
+        with self.__lock:
+            self.__benched[key] = max(self.__benched[key],
+                                      time.monotonic() + seconds)
+
+    def throttled(self, key, retry_after=None):
+        """
+          `key` received a 429: bench it.
+        """
+        self.__limiters[key].throttled(retry_after)
+        self.bench(key, retry_after or THROTTLED_BENCH_TIME)
+
+    def unauthorized(self, key):
+        """
+          `key` received a 401 (invalid, disabled or out of plan): bench it.
+        """
+        self.bench(key, UNAUTHORIZED_BENCH_TIME)
+
+    def refresh(self, cmc):
+        """
+          Update the limits and usage of each key with `key_info()`, using
+          the CoinMarketCapAPI instance `cmc`. Key info calls are free. Keys
+          answering 429 or 401 are benched.
+        """
+        from . import CoinMarketCapAPIError
+
+        for key in self.keys:
+            try:
+                rep = cmc.key_info(api_key=key)
+            except CoinMarketCapAPIError as e:
+                status_code = getattr(e.rep, 'status_code', None)
+                if status_code == 429:
+                    self.throttled(key)
+                elif status_code == 401:
+                    self.unauthorized(key)
+                else:
+                    raise
+                continue
+            self.__limiters[key].update_from_key_info(rep)
+
+    def stats(self):
+        """
+          List of dicts (one per key): `credits_used` (day, month),
+          `credits_left` and `benched` (seconds left).
+        """
+        now = time.monotonic()
+        return [{
+            'key': key,
+            'credits_used': self.__limiters[key].credits_used,
+            'credits_left': self.__limiters[key].credits_left,
+            'benched': max(0., self.__benched[key] - now),
+        } for key in self.keys]
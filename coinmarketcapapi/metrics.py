@@ -0,0 +1,297 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# MIT License
+#
+# Copyright (c) 2019-2025 Remi SARRAZIN
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import socket
+import threading
+from bisect import bisect_left
+
+# Upper bounds of the histogram buckets: seconds for the request phases,
+# bytes for the payload sizes.
+LATENCY_BUCKETS = (.005, .01, .025, .05, .1, .25, .5, 1., 2.5, 5., 10.,
+                   float('inf'))
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304,
+                float('inf'))
+# Request phases recorded by the client: rate limiter wait, time to the
+# response headers (connection included), body download, total time and
+# decoding of `data` (recorded on its first access, after the request, so
+# not part of the total).
+PHASES = ('wait', 'ttfb', 'download', 'total', 'decode')
+
+
+class Histogram(object):
+    """
+        Histogram
+
+        Fixed buckets histogram (not thread-safe, see Metrics).
+    """
+
+    __slots__ = ('buckets', 'counts', 'sum')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    @property
+    def count(self):
+        return sum(self.counts)
+
+    def quantile(self, q):
+        """
+          Estimate of the `q` quantile (0 to 1), interpolated in its bucket.
+        """
+        total = self.count
+        if not total:
+            return None
+        rank = q * total
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[i - 1] if i else 0.
+                upper = self.buckets[i]
+                if upper == float('inf'):
+                    return lower
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-2]
+
+    def snapshot(self):
+        cumulative = []
+        seen = 0
+        for count in self.counts:
+            seen += count
+            cumulative.append(seen)
+        return {
+            'count': seen,
+            'sum': self.sum,
+            'p50': self.quantile(.5),
+            'p99': self.quantile(.99),
+            'buckets': dict(zip(self.buckets, cumulative)),
+        }
+
+
+class Metrics(object):
+    """
+        Metrics
+
+        Collect the metrics of a client (pass `metrics=True` or a Metrics
+        instance to CoinMarketCapAPI), per endpoint path:
+        - histograms of the request phases (seconds, see `PHASES`) and of
+            the payload sizes (`size`, bytes),
+        - counters: `requests` (by HTTP status), `credits`, `cache` (hits,
+            stale hits and misses), `revalidations` of stale responses
+            (changed, unchanged or error), `retries` (by reason) and
+            `errors` (by API error code or exception).
+
+        Metrics are exported with `snapshot()` or `prometheus()`, and every
+        event is also passed to the `sinks`: callables taking `(kind, name,
+        path, label, value)`, kind being 'count' or 'observe' (see
+        StatsdSink).
+    """
+
+    def __init__(self, sinks=()):
+        self.sinks = list(sinks)
+        self.__lock = threading.Lock()
+        self.__counters = {}
+        self.__histograms = {}
+
+    def increment(self, name, path, label=None, value=1):
+        key = (name, path, label)
+        with self.__lock:
+            self.__counters[key] = self.__counters.get(key, 0) + value
+        for sink in self.sinks:
+            sink('count', name, path, label, value)
+
+    def observe(self, name, path, value):
+        key = (name, path)
+        with self.__lock:
+            histogram = self.__histograms.get(key, None)
+            if histogram is None:
+                histogram = self.__histograms[key] = Histogram(
+                    SIZE_BUCKETS if name == 'size' else LATENCY_BUCKETS)
+            histogram.observe(value)
+        for sink in self.sinks:
+            sink('observe', name, path, None, value)
+
+    def cache(self, path, hit, stale=False):
+        if stale:
+            self.increment('cache', path, 'stale')
+        else:
+            self.increment('cache', path, 'hit' if hit else 'miss')
+
+    def retry(self, path, reason):
+        self.increment('retries', path, reason)
+
+    def error(self, path, reason):
+        self.increment('errors', path, reason)
+
+    def response(self, path, status_code, size, credits, timings):
+        """
+          Record a received response, `timings` mapping phases to seconds
+          (`size` is None if unknown).
+        """
+        self.increment('requests', path, str(status_code))
+        if credits:
+            self.increment('credits', path, value=credits)
+        if size is not None:
+            self.observe('size', path, size)
+        for phase, seconds in timings.items():
+            self.observe(phase, path, seconds)
+
+    def counter(self, name, path=None):
+        """
+          Value of a counter, summed over its labels (and paths if `path` is
+          None).
+        """
+        with self.__lock:
+            return sum(value for key, value in self.__counters.items()
+                       if key[0] == name and path in (None, key[1]))
+
+    def histogram(self, name, path):
+        """
+          Copy of the Histogram of a phase (or 'size') of `path`, or None.
+        """
+        with self.__lock:
+            histogram = self.__histograms.get((name, path), None)
+            if histogram is None:
+                return None
+            copy = Histogram(histogram.buckets)
+            copy.counts = list(histogram.counts)
+            copy.sum = histogram.sum
+            return copy
+
+    @property
+    def cache_hit_ratio(self):
+        with self.__lock:
+            hits = misses = 0
+            for (name, _, label), value in self.__counters.items():
+                if name == 'cache':
+                    if label in ('hit', 'stale'):
+                        hits += value
+                    else:
+                        misses += value
+        return hits / (hits + misses) if hits + misses else None
+
+    def snapshot(self):
+        """
+          Dict of all the metrics: `counters` as {name: {path: {label:
+          value}}}, `histograms` as {name: {path: {count, sum, p50, p99,
+          buckets}}} (cumulative buckets) and `cache_hit_ratio`.
+        """
+        counters = {}
+        histograms = {}
+        with self.__lock:
+            for (name, path, label), value in self.__counters.items():
+                counters.setdefault(name, {}).setdefault(
+                    path, {})[label] = value
+            for (name, path), histogram in self.__histograms.items():
+                histograms.setdefault(name, {})[path] = histogram.snapshot()
+        return {
+            'counters': counters,
+            'histograms': histograms,
+            'cache_hit_ratio': self.cache_hit_ratio,
+        }
+
+    def prometheus(self, prefix='coinmarketcapapi'):
+        """
+          Metrics in the Prometheus text exposition format.
+        """
+        snapshot = self.snapshot()
+        lines = []
+        for name, paths in sorted(snapshot['counters'].items()):
+            metric = '{}_{}_total'.format(prefix, name)
+            lines.append('# TYPE {} counter'.format(metric))
+            for path, labels in sorted(paths.items()):
+                for label, value in sorted(labels.items(),
+                                           key=lambda item: str(item[0])):
+                    tags = 'endpoint="{}"'.format(path)
+                    if label is not None:
+                        tags += ',label="{}"'.format(label)
+                    lines.append('{}{{{}}} {}'.format(metric, tags, value))
+        # Histogram families: one per metric, the phases being a label of
+        # the request seconds family (samples of a family are contiguous).
+        families = {}
+        for name, paths in snapshot['histograms'].items():
+            if name == 'size':
+                metric, tags = '{}_response_bytes'.format(prefix), ''
+            else:
+                metric = '{}_request_seconds'.format(prefix)
+                tags = ',phase="{}"'.format(name)
+            for path, histogram in paths.items():
+                families.setdefault(metric, []).append((
+                    'endpoint="{}"{}'.format(path, tags), histogram))
+        for metric, series in sorted(families.items()):
+            lines.append('# TYPE {} histogram'.format(metric))
+            for tags, histogram in sorted(series, key=lambda item: item[0]):
+                for bound, count in histogram['buckets'].items():
+                    lines.append('{}_bucket{{{},le="{}"}} {}'.format(
+                        metric, tags,
+                        '+Inf' if bound == float('inf') else bound, count))
+                lines.append('{}_sum{{{}}} {}'.format(
+                    metric, tags, histogram['sum']))
+                lines.append('{}_count{{{}}} {}'.format(
+                    metric, tags, histogram['count']))
+        return '\n'.join(lines) + '\n'
+
+
+class StatsdSink(object):
+    """
+        StatsdSink
+
+        Metrics sink sending each event to a StatsD server over UDP, eg.
+        `coinmarketcapapi.ttfb.cryptocurrency.map:12.3|ms`. Phases are sent
+        as timers (milliseconds), sizes as histograms, others as counters.
+    """
+
+    def __init__(self, host='127.0.0.1', port=8125, prefix='coinmarketcapapi'):
+        self.address = (host, port)
+        self.prefix = prefix
+        self.__socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def format(self, kind, name, path, label, value):
+        metric = '.'.join(
+            part for part in [self.prefix, name] + path.split('/') +
+            [label if label is not None else '']
+            if part)
+        if kind == 'count':
+            return '{}:{}|c'.format(metric, value)
+        if name == 'size':
+            return '{}:{}|h'.format(metric, value)
+        return '{}:{:.3f}|ms'.format(metric, value * 1000)
+
+    def __call__(self, kind, name, path, label, value):
+        line = self.format(kind, name, path, label, value)
+        try:
+            self.__socket.sendto(line.encode('ascii'), self.address)
+        except OSError:
+            # Metrics must never break requests.
+            pass
+
+    def close(self):
+        self.__socket.close()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# MIT License
+#
+# Copyright (c) 2019-2025 Remi SARRAZIN
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+# Maximum `limit` accepted by the `start`/`limit` paginated endpoints.
+PAGE_SIZES = {
+    'cryptocurrency_map': 5000,
+    'cryptocurrency_listings_latest': 5000,
+    'cryptocurrency_listings_historical': 5000,
+    'cryptocurrency_marketpairs_latest': 5000,
+    'exchange_map': 5000,
+    'exchange_listings_latest': 5000,
+    'exchange_marketpairs_latest': 5000,
+    'fiat_map': 5000,
+    'fearandgreed_historical': 500,
+}
+DEFAULT_PAGE_SIZE = 100
+
+
+def page_records(data):
+    """
+      Records of a page: the `data` list, or its `market_pairs` list for
+      the market pairs endpoints.
+    """
+    if isinstance(data, dict):
+        return data.get('market_pairs', [])
+    return data or []
+
+
+def iter_pages(cmc, method, page_size=None, start=1, prefetch=False,
+               **kwargs):
+    """
+      Walk the pages of the paginated `method` (eg. 'cryptocurrency_map') of
+      the CoinMarketCapAPI instance `cmc`, yielding one Response per page of
+      `page_size` records (default: the endpoint maximum). With `prefetch`,
+      the next page is requested in a background thread while the current
+      one is being consumed. Other keyword arguments are passed to each call.
+    """
+    bound_method = getattr(cmc, method)
+    page_size = page_size or PAGE_SIZES.get(method, DEFAULT_PAGE_SIZE)
+
+    def fetch(page_start):
+        return bound_method(start=page_start, limit=page_size, **kwargs)
+
+    if not prefetch:
+        while True:
+            rep = fetch(start)
+            yield rep
+            if len(page_records(rep.data)) < page_size:
+                return
+            start += page_size
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(fetch, start)
+        while future is not None:
+            rep = future.result()
+            future = None
+            if len(page_records(rep.data)) >= page_size:
+                start += page_size
+                future = executor.submit(fetch, start)
+            yield rep
+
+
+def iter_records(cmc, method, page_size=None, start=1, prefetch=False,
+                 **kwargs):
+    """
+      Same as `iter_pages()` but yields the records of each page one by one,
+      so a whole listing is processed with at most two pages in memory.
+
+      ```
+          for coin in iter_records(cmc, 'cryptocurrency_listings_latest',
+                                   prefetch=True, convert='EUR'):
+              ...
+      ```
+    """
+    for rep in iter_pages(cmc, method, page_size, start, prefetch, **kwargs):
+        for record in page_records(rep.data):
+            yield record
+
+
+async def aiter_pages(cmc, method, page_size=None, start=1, prefetch=False,
+                      **kwargs):
+    """
+      Asyncio version of `iter_pages()` for AsyncCoinMarketCapAPI.
+    """
+    bound_method = getattr(cmc, method)
+    page_size = page_size or PAGE_SIZES.get(method, DEFAULT_PAGE_SIZE)
+
+    def fetch(page_start):
+        return asyncio.ensure_future(
+            bound_method(start=page_start, limit=page_size, **kwargs))
+
+    future = fetch(start)
+    try:
+        while future is not None:
+            rep = await future
+            future = None
+            has_next = len(page_records(rep.data)) >= page_size
+            if has_next:
+                start += page_size
+                if prefetch:
+                    future = fetch(start)
+            yield rep
+            if has_next and future is None:
+                future = fetch(start)
+    finally:
+        if future is not None:
+            future.cancel()
+
+
+async def aiter_records(cmc, method, page_size=None, start=1,
+                        prefetch=False, **kwargs):
+    """
+      Asyncio version of `iter_records()` for AsyncCoinMarketCapAPI.
+    """
+    async for rep in aiter_pages(cmc, method, page_size, start, prefetch,
+                                 **kwargs):
+        for record in page_records(rep.data):
+            yield record
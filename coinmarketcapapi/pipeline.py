@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# MIT License
+#
+# Copyright (c) 2019-2025 Remi SARRAZIN
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from .columnar import payload_columns
+from .jsonlib import loads as json_loads
+
+
+def decode_columns(content, fields=None, transform=None):
+    """
+      Decode a raw API payload (bytes) and return the columns of its `data`
+      (see `columnar.payload_columns()`), or `transform(columns)`. Runs in
+      the worker processes of ProcessPipeline.
+    """
+    payload = json_loads(content)
+    data = payload.get('data', {}) if isinstance(payload, dict) else {}
+    columns = payload_columns(data, fields)
+    if transform is not None:
+        return transform(columns)
+    return columns
+
+
+class ProcessPipeline(object):
+    """
+        ProcessPipeline
+
+        Decode and transform responses in a pool of `max_workers` processes
+        (default: the number of CPUs), so heavy payloads (eg. historical
+        listings snapshots) are processed on all cores instead of the one
+        holding the GIL. Only the raw body is sent to the workers, and only
+        compact columns are sent back: NumPy arrays or `array.array`
+        buffers, pickled as raw bytes.
+
+        Each response gives the columns of its `data` (dotted `fields`,
+        default all of them, eg. 'quote.USD.price'), or the result of
+        `transform(columns)`, eg. derived metrics. `transform` must be
+        picklable (a module level function).
+
+        ```
+            def market_share(columns):
+                caps = columns['quote.USD.market_cap']
+                return columns['id'], caps / caps.sum()
+
+            with ProcessPipeline(transform=market_share) as pipeline:
+                reps = cmc.gather([
+                    ('cryptocurrency_listings_historical', {'date': day})
+                    for day in days])
+                # gather() returns the exceptions of failed calls.
+                reps = [rep for rep in reps if not isinstance(rep, Exception)]
+                for ids, shares in pipeline.map(reps):
+                    ...
+        ```
+    """
+
+    def __init__(self, max_workers=None, fields=None, transform=None):
+        self.fields = fields
+        self.transform = transform
+        self.__executor = ProcessPoolExecutor(max_workers=max_workers)
+
+    def submit(self, rep):
+        """
+          Process a Response (or raw payload bytes) in a worker. Returns a
+          Future of its result. A Response whose `data` is already decoded
+          (no raw body left) is processed in this process. Anything else
+          (eg. a StreamingResponse, or an exception returned by `gather()`)
+          raises a TypeError.
+        """
+        from . import Response
+        if isinstance(rep, (bytes, bytearray)):
+            content = rep
+        elif isinstance(rep, Response):
+            content = rep.content
+        else:
+            raise TypeError(
+                'ProcessPipeline expects a Response or bytes, not {}'.format(
+                    repr(rep)))
+        if content is not None:
+            return self.__executor.submit(
+                decode_columns, content, self.fields, self.transform)
+        future = Future()
+        try:
+            columns = payload_columns(rep.data, self.fields)
+            if self.transform is not None:
+                columns = self.transform(columns)
+            future.set_result(columns)
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def map(self, reps):
+        """
+          Process `reps` in parallel and iterate over their results, in
+          order.
+        """
+        futures = [self.submit(rep) for rep in reps]
+        for future in futures:
+            yield future.result()
+
+    def close(self):
+        """
+          Wait for the pending responses and stop the workers.
+        """
+        self.__executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
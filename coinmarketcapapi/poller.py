@@ -0,0 +1,306 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# MIT License
+#
+# Copyright (c) 2019-2025 Remi SARRAZIN
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import heapq
+import logging
+import threading
+import time
+
+from .timeutils import to_timestamp
+
+# Refresh period of the endpoints, in seconds.
+POLL_INTERVALS = {
+    'cryptocurrency_trending_latest': 600,
+    'cryptocurrency_trending_mostvisited': 600,
+    'cryptocurrency_trending_gainerslosers': 600,
+    'fearandgreed_latest': 3600,
+}
+DEFAULT_POLL_INTERVAL = 60
+# Delay after the expected refresh, so the new values are published.
+REFRESH_LAG = 5
+
+logger = logging.getLogger(__name__)
+
+
+def _flatten(record, prefix='', fields=None):
+    if fields is None:
+        fields = {}
+    for name, value in record.items():
+        if isinstance(value, dict):
+            _flatten(value, prefix + name + '.', fields)
+        else:
+            fields[prefix + name] = value
+    return fields
+
+
+def keyed_records(data, key='id'):
+    """
+      Map the `key` of each record of a `data` payload to the record:
+      lists, dicts keyed by id (or symbol) and single objects (eg. global
+      metrics, keyed by None) are supported.
+    """
+    if isinstance(data, list):
+        records = data
+    elif isinstance(data, dict) and data and all(
+            isinstance(value, (dict, list)) for value in data.values()):
+        records = []
+        for value in data.values():
+            if isinstance(value, list):
+                records.extend(value)
+            else:
+                records.append(value)
+    else:
+        return {None: data or {}}
+    return dict((record.get(key), record) for record in records)
+
+
+def diff_records(previous, current):
+    """
+      Changes between two flattened `keyed_records()`: a dict mapping the
+      key of each new or changed record to its new or changed (dotted)
+      fields, and of each removed record to None.
+    """
+    changes = {}
+    for asset, fields in current.items():
+        old = previous.get(asset, None)
+        if old is None:
+            changes[asset] = fields
+            continue
+        changed = dict((name, value) for name, value in fields.items()
+                       if old.get(name, None) != value)
+        if changed:
+            changes[asset] = changed
+    for asset in previous:
+        if asset not in current:
+            changes[asset] = None
+    return changes
+
+
+def _updates(records):
+    """
+      Map the key of each record to its `last_updated` field, or None if a
+      record has none.
+    """
+    updates = {}
+    for asset, record in records.items():
+        updated = record.get('last_updated', None)
+        if updated is None:
+            return None
+        updates[asset] = updated
+    return updates
+
+
+class Watch(object):
+    """
+        Watch
+
+        One polled endpoint of a Poller, see `Poller.watch()`.
+    """
+
+    def __init__(self, method, interval, key, params):
+        self.method = method
+        self.interval = interval
+        self.key = key
+        self.params = params
+        self.subscribers = []
+        self.records = {}
+        self.updates = None
+        self.last_updated = None
+        self.polls = 0
+        self.skipped = 0
+
+    def subscribe(self, subscriber):
+        """
+          Add a subscriber: a callable, called as `subscriber(method,
+          changes)`, or a queue (any object with a `put()` method) receiving
+          `(method, changes)` tuples. Returns the subscriber.
+        """
+        self.subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        self.subscribers.remove(subscriber)
+
+    def update(self, data):
+        """
+          Compare `data` with the previous payload and publish the changes.
+          Returns the changes, or None if the payload was not refreshed (the
+          same records with the same `last_updated` fields).
+        """
+        self.polls += 1
+        records = keyed_records(data, self.key)
+        updates = _updates(records)
+        if updates is not None and updates == self.updates:
+            self.skipped += 1
+            return None
+        self.updates = updates
+        if updates:
+            self.last_updated = max(updates.values())
+        current = dict((asset, _flatten(record))
+                       for asset, record in records.items())
+        changes = diff_records(self.records, current)
+        self.records = current
+        if changes:
+            for subscriber in list(self.subscribers):
+                if hasattr(subscriber, 'put'):
+                    subscriber.put((self.method, changes))
+                else:
+                    subscriber(self.method, changes)
+        return changes
+
+    def next_poll(self, now):
+        """
+          Time of the next poll: one interval after the last update of the
+          data (plus `REFRESH_LAG`), or one interval from now.
+        """
+        updated = to_timestamp(self.last_updated) if self.last_updated \
+            else None
+        if updated is not None:
+            due = updated + self.interval + REFRESH_LAG
+            if now < due <= now + self.interval:
+                return due
+        return now + self.interval
+
+
+class Poller(object):
+    """
+        Poller
+
+        Poll `*_latest` endpoints from a background thread at their refresh
+        period, aligned to the `last_updated` field of the data. Payloads
+        that were not refreshed are skipped, and subscribers only receive
+        the changes: for each new or changed asset, its changed fields.
+
+        ```
+            poller = Poller(cmc)
+            listings = poller.watch('cryptocurrency_listings_latest',
+                                    limit=200)
+            listings.subscribe(lambda method, changes: ...)
+            changes = listings.subscribe(queue.Queue())
+            poller.start()
+            ...
+            poller.stop()
+        ```
+
+        Changes are dicts mapping the asset id to its changed fields (dotted
+        paths, eg. 'quote.USD.price'), or to None if it left the results.
+        Errors of a poll are passed to `on_error(watch, exception)` (logged
+        by default) and the endpoint is polled again at the next period.
+    """
+
+    def __init__(self, cmc, on_error=None):
+        self.cmc = cmc
+        self.on_error = on_error
+        self.watches = []
+        self.__queue = []
+        self.__lock = threading.Lock()
+        self.__wakeup = threading.Condition(self.__lock)
+        self.__thread = None
+        self.__stopping = False
+
+    def watch(self, method, interval=None, key='id', **kwargs):
+        """
+          Poll `method` every `interval` seconds (default: the endpoint
+          refresh period), with the given keyword arguments. Records are
+          identified by their `key` field. Returns a Watch, to subscribe to.
+        """
+        if interval is None:
+            interval = POLL_INTERVALS.get(method, DEFAULT_POLL_INTERVAL)
+        watch = Watch(method, interval, key, kwargs)
+        with self.__lock:
+            self.watches.append(watch)
+            heapq.heappush(self.__queue, (time.time(), id(watch), watch))
+            self.__wakeup.notify()
+        return watch
+
+    def poll(self, watch):
+        """
+          Poll `watch` once, returns its changes (None if not refreshed).
+        """
+        rep = getattr(self.cmc, watch.method)(**watch.params)
+        return watch.update(rep.data)
+
+    def __run(self):
+        while True:
+            with self.__lock:
+                while not self.__stopping and (
+                        not self.__queue or
+                        self.__queue[0][0] > time.time()):
+                    timeout = self.__queue[0][0] - time.time() \
+                        if self.__queue else None
+                    self.__wakeup.wait(timeout)
+                if self.__stopping:
+                    return
+                _, _, watch = heapq.heappop(self.__queue)
+            try:
+                self.poll(watch)
+            except Exception as e:
+                if self.on_error is not None:
+                    self.on_error(watch, e)
+                else:
+                    logger.exception('Polling %s failed', watch.method)
+            with self.__lock:
+                if watch in self.watches:
+                    heapq.heappush(self.__queue, (
+                        watch.next_poll(time.time()), id(watch), watch))
+
+    def unwatch(self, watch):
+        """
+          Stop polling `watch`.
+        """
+        with self.__lock:
+            self.watches.remove(watch)
+            self.__queue = [item for item in self.__queue
+                            if item[2] is not watch]
+            heapq.heapify(self.__queue)
+
+    def start(self):
+        """
+          Start the polling thread.
+        """
+        if self.__thread is not None:
+            return
+        self.__stopping = False
+        self.__thread = threading.Thread(
+            target=self.__run, name='coinmarketcapapi-poller', daemon=True)
+        self.__thread.start()
+
+    def stop(self, timeout=None):
+        """
+          Stop the polling thread, waiting for the poll in progress.
+        """
+        with self.__lock:
+            self.__stopping = True
+            self.__wakeup.notify()
+        if self.__thread is not None:
+            self.__thread.join(timeout)
+            self.__thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# MIT License
+#
+# Copyright (c) 2019-2025 Remi SARRAZIN
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import asyncio
+import email.utils
+import threading
+import time
+
+# Basic plan limits, see https://coinmarketcap.com/api/pricing/
+DEFAULT_REQUESTS_PER_MINUTE = 30
+
+
+def parse_retry_after(value):
+    """
+      Parse a `Retry-After` header (seconds or HTTP date) into seconds,
+      returns None if missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(0., float(value))
+    except ValueError:
+        pass
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date is None:
+        return None
+    return max(0., date.timestamp() - time.time())
+
+
+class RateLimiter(object):
+    """
+        RateLimiter
+
+        Client-side rate limiter shared by all the threads (and coroutines)
+        using a CoinMarketCapAPI instance:
+        - a token bucket of `requests_per_minute` requests,
+        - a daily and a monthly credit budget (UTC days and months), updated
+            from the `credit_count` of each response.
+
+        When no token is available, a request waits up to `max_wait` seconds
+        (None to wait indefinitely), otherwise it is shed. A request is also
+        shed when a credit budget is exhausted.
+    """
+
+    def __init__(self, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE,
+                 daily_credits=None, monthly_credits=None, max_wait=60):
+        self.requests_per_minute = requests_per_minute
+        self.daily_credits = daily_credits
+        self.monthly_credits = monthly_credits
+        self.max_wait = max_wait
+        self.__lock = threading.Lock()
+        self.__tokens = float(requests_per_minute or 0)
+        self.__updated = time.monotonic()
+        self.__day = self.__month = None
+        self.__day_credits = self.__month_credits = 0
+
+    @classmethod
+    def from_key_info(cls, rep, **kwargs):
+        """
+          Build a RateLimiter from a `key_info()` Response.
+        """
+        limiter = cls(**kwargs)
+        limiter.update_from_key_info(rep)
+        return limiter
+
+    def update_from_key_info(self, rep):
+        """
+          Update limits and current usage from a `key_info()` Response.
+        """
+        plan = rep.data.get('plan', {})
+        usage = rep.data.get('usage', {})
+        with self.__lock:
+            self.__roll()
+            self.requests_per_minute = plan.get(
+                'rate_limit_minute', self.requests_per_minute)
+            self.daily_credits = plan.get(
+                'credit_limit_daily', self.daily_credits)
+            self.monthly_credits = plan.get(
+                'credit_limit_monthly', self.monthly_credits)
+            self.__day_credits = usage.get('current_day', {}).get(
+                'credits_used', self.__day_credits)
+            self.__month_credits = usage.get('current_month', {}).get(
+                'credits_used', self.__month_credits)
+            self.__refill()
+            requests_left = usage.get('current_minute', {}).get(
+                'requests_left', None)
+            if requests_left is not None:
+                self.__tokens = min(self.__tokens, requests_left)
+
+    def __roll(self):
+        now = time.gmtime()
+        day, month = (now.tm_year, now.tm_yday), (now.tm_year, now.tm_mon)
+        if day != self.__day:
+            self.__day, self.__day_credits = day, 0
+        if month != self.__month:
+            self.__month, self.__month_credits = month, 0
+
+    def __refill(self):
+        now = time.monotonic()
+        if self.requests_per_minute:
+            self.__tokens = min(
+                float(self.requests_per_minute),
+                self.__tokens +
+                (now - self.__updated) * self.requests_per_minute / 60.)
+        self.__updated = now
+
+    def __wait(self, credits):
+        self.__roll()
+        if self.daily_credits is not None and \
+                self.__day_credits + credits > self.daily_credits:
+            return None
+        if self.monthly_credits is not None and \
+                self.__month_credits + credits > self.monthly_credits:
+            return None
+        if not self.requests_per_minute:
+            return 0
+        self.__refill()
+        if self.__tokens < 1:
+            return (1 - self.__tokens) * 60. / self.requests_per_minute
+        return 0
+
+    def estimate(self, credits=1):
+        """
+          Seconds a request expected to cost `credits` would wait for a slot
+          (ignoring `max_wait`), without reserving it. None if a credit
+          budget is exhausted.
+        """
+        with self.__lock:
+            return self.__wait(credits)
+
+    def reserve(self, credits=1):
+        """
+          Reserve a request slot expected to cost `credits`. Returns the
+          number of seconds to wait before sending the request, or None if
+          the request must be shed.
+        """
+        with self.__lock:
+            wait = self.__wait(credits)
+            if wait is None:
+                return None
+            if self.max_wait is not None and wait > self.max_wait:
+                return None
+            if self.requests_per_minute:
+                self.__tokens -= 1
+            return wait
+
+    def acquire(self, credits=1):
+        """
+          Wait for a request slot, returns False if the request is shed.
+        """
+        wait = self.reserve(credits)
+        if wait is None:
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+    async def aacquire(self, credits=1):
+        """
+          Asyncio version of `acquire()`.
+        """
+        wait = self.reserve(credits)
+        if wait is None:
+            return False
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return True
+
+    def record(self, credit_count):
+        """
+          Account the credits used by a response.
+        """
+        with self.__lock:
+            self.__roll()
+            self.__day_credits += credit_count or 0
+            self.__month_credits += credit_count or 0
+
+    def throttled(self, retry_after=None):
+        """
+          The server answered 429: empty the bucket so pending requests wait
+          for the next tokens (or `retry_after` seconds) instead of piling
+          up more 429 errors.
+        """
+        with self.__lock:
+            self.__refill()
+            self.__tokens = min(self.__tokens, 0.)
+            if retry_after and self.requests_per_minute:
+                self.__tokens = min(
+                    self.__tokens,
+                    1 - retry_after * self.requests_per_minute / 60.)
+
+    @property
+    def headroom(self):
+        """
+          Requests that can be sent right now without waiting.
+        """
+        with self.__lock:
+            if not self.requests_per_minute:
+                return float('inf')
+            self.__refill()
+            return max(0., self.__tokens)
+
+    @property
+    def credits_left(self):
+        """
+          Credits left in the smallest of the daily and monthly budgets
+          (infinite without budget).
+        """
+        with self.__lock:
+            self.__roll()
+            left = float('inf')
+            if self.daily_credits is not None:
+                left = min(left, self.daily_credits - self.__day_credits)
+            if self.monthly_credits is not None:
+                left = min(left, self.monthly_credits - self.__month_credits)
+            return left
+
+    @property
+    def credits_used(self):
+        """
+          Credits used in the current (day, month).
+        """
+        with self.__lock:
+            self.__roll()
+            return (self.__day_credits, self.__month_credits)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# MIT License
+#
+# Copyright (c) 2019-2025 Remi SARRAZIN
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import random
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class RetryPolicy(object):
+    """
+        RetryPolicy
+
+        Retry policy of CoinMarketCapAPI requests failing with a retryable
+        HTTP status (`retry_statuses`) or a connection error / timeout.
+
+        - `max_attempts`: (int) maximum number of attempts, first included.
+        - `base_delay`, `max_delay`: (float) bounds of the delay in seconds
+            between two attempts, computed with "decorrelated jitter"
+            (a random delay between `base_delay` and 3 times the previous
+            one) so that clients do not retry in lockstep.
+        - `max_total_wait`: (float | None) give up when the cumulated delay
+            would exceed this number of seconds.
+        - `non_idempotent`: (iterable) endpoint paths never retried.
+        - `on_retry`: (callable | None) called before each retry with a
+            dict: `path`, `attempt` (number of the failed attempt), `delay`,
+            `total_wait`, `status_code` (or None) and `error` (or None).
+
+        A `Retry-After` header is honored: the delay is at least the given
+        value, and the request is not retried if it exceeds `max_delay`.
+    """
+
+    def __init__(self, max_attempts=3, base_delay=0.5, max_delay=30.,
+                 max_total_wait=None, retry_statuses=RETRY_STATUSES,
+                 retry_network_errors=True, non_idempotent=(),
+                 on_retry=None):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_total_wait = max_total_wait
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_network_errors = retry_network_errors
+        self.non_idempotent = frozenset(non_idempotent)
+        self.on_retry = on_retry
+
+    def next_delay(self, path, attempt, previous_delay=None, total_wait=0.,
+                   status_code=None, error=None, retry_after=None):
+        """
+          Delay in seconds before retrying the failed `attempt` (1 for the
+          first request) of `path`, or None if it must not be retried.
+        """
+        if attempt >= self.max_attempts or path in self.non_idempotent:
+            return None
+        if error is not None:
+            if not self.retry_network_errors:
+                return None
+        elif status_code not in self.retry_statuses:
+            return None
+
+        previous_delay = previous_delay or self.base_delay
+        delay = min(self.max_delay,
+                    random.uniform(self.base_delay, previous_delay * 3))
+        if retry_after is not None:
+            if retry_after > self.max_delay:
+                return None
+            delay = max(delay, retry_after)
+        if self.max_total_wait is not None and \
+                total_wait + delay > self.max_total_wait:
+            return None
+
+        if self.on_retry is not None:
+            self.on_retry({
+                'path': path,
+                'attempt': attempt,
+                'delay': delay,
+                'total_wait': total_wait + delay,
+                'status_code': status_code,
+                'error': error,
+            })
+        return delay
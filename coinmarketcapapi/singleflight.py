@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# MIT License
+#
+# Copyright (c) 2019-2025 Remi SARRAZIN
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import asyncio
+import threading
+
+
+class _Call(object):
+
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """
+        SingleFlight
+
+        Coalesce identical concurrent calls made from several threads: while
+        a call for a key is in flight, other callers of the same key wait for
+        it and share its result (or exception) instead of running their own.
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__calls = {}
+
+    def do(self, key, function):
+        """
+          Return `function()`, or the result of the identical call in flight.
+        """
+        with self.__lock:
+            call = self.__calls.get(key, None)
+            leader = call is None
+            if leader:
+                call = self.__calls[key] = _Call()
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self.__lock:
+                del self.__calls[key]
+            call.event.set()
+
+    def __len__(self):
+        return len(self.__calls)
+
+
+class AsyncSingleFlight(object):
+    """
+        AsyncSingleFlight
+
+        Asyncio version of SingleFlight: concurrent identical calls in the
+        same event loop await a single coroutine.
+    """
+
+    def __init__(self):
+        self.__calls = {}
+
+    async def do(self, key, function):
+        """
+          Return `await function()`, or the result of the identical call in
+          flight.
+        """
+        future = self.__calls.get(key, None)
+        if future is not None:
+            # Shielded: a cancelled follower must not cancel the leader.
+            return await asyncio.shield(future)
+
+        future = asyncio.ensure_future(function())
+        self.__calls[key] = future
+        try:
+            return await asyncio.shield(future)
+        finally:
+            if future.done():
+                self.__calls.pop(key, None)
+            else:
+                future.add_done_callback(
+                    lambda _: self.__calls.pop(key, None))
+
+    def __len__(self):
+        return len(self.__calls)
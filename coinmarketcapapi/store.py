@@ -0,0 +1,248 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# MIT License
+#
+# Copyright (c) 2019-2025 Remi SARRAZIN
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import json
+import sqlite3
+import threading
+import time
+
+from .backfill import MAX_POINTS, record_time, series_records
+from .cache import normalize_params
+from .columnar import to_columns
+from .jsonlib import loads
+from .pagination import iter_pages, page_records
+from .timeutils import interval_seconds, to_timestamp
+
+# Historical endpoints paginated with `start`/`limit`, newest first, the
+# others taking `time_start`/`time_end`/`interval`.
+PAGED_METHODS = ('fearandgreed_historical',)
+
+_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS points ('
+    ' series TEXT NOT NULL, asset TEXT NOT NULL, time INTEGER NOT NULL,'
+    ' record TEXT NOT NULL, PRIMARY KEY (series, asset, time))'
+    ' WITHOUT ROWID',
+    'CREATE TABLE IF NOT EXISTS coverage ('
+    ' series TEXT NOT NULL, asset TEXT NOT NULL,'
+    ' time_start INTEGER NOT NULL, time_end INTEGER NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS coverage_series ON coverage (series, asset)',
+)
+
+
+def subtract_ranges(start, end, ranges):
+    """
+      Parts of [start, end] not covered by the sorted, disjoint `ranges`.
+    """
+    gaps = []
+    for range_start, range_end in ranges:
+        if range_end < start:
+            continue
+        if range_start > end:
+            break
+        if range_start > start:
+            gaps.append((start, range_start))
+        start = max(start, range_end)
+    if start < end:
+        gaps.append((start, end))
+    return gaps
+
+
+class TimeSeriesStore(object):
+    """
+        TimeSeriesStore
+
+        SQLite store of historical series (`cryptocurrency_ohlcv_historical`,
+        `cryptocurrency_quotes_historical`, `globalmetrics_quotes_historical`
+        and `fearandgreed_historical`). The store records which time ranges
+        were fetched: `get()` reads the stored records and only requests the
+        missing gaps from the API, so a backtest downloads each range once.
+
+        ```
+            store = TimeSeriesStore('history.sqlite', cmc)
+            records = store.get('cryptocurrency_ohlcv_historical',
+                                '2020-01-01', '2025-01-01', id=1,
+                                interval='daily', convert='EUR')
+            columns = store.columns('cryptocurrency_ohlcv_historical',
+                                    '2024-01-01', '2025-01-01', id=1,
+                                    convert='EUR')
+        ```
+
+        Each (method, interval, other parameters) gives a separate series.
+        The current, not yet closed, interval is fetched again next time.
+    """
+
+    def __init__(self, path, cmc=None):
+        self.path = path
+        self.cmc = cmc
+        self.__lock = threading.Lock()
+        self.__db = sqlite3.connect(path, check_same_thread=False)
+        self.__db.execute('PRAGMA journal_mode=WAL')
+        with self.__db:
+            for statement in _SCHEMA:
+                self.__db.execute(statement)
+
+    def close(self):
+        self.__db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @staticmethod
+    def series_key(method, interval, params):
+        """
+          Name of the series of `method` with the given `interval` and other
+          request parameters.
+        """
+        return '{}|{}|{}'.format(method, interval, '&'.join(
+            '{}={}'.format(*item) for item in normalize_params(params)))
+
+    def coverage(self, series, asset):
+        """
+          Sorted list of the (time_start, time_end) ranges stored for the
+          given series and asset.
+        """
+        with self.__lock:
+            return self.__db.execute(
+                'SELECT time_start, time_end FROM coverage'
+                ' WHERE series = ? AND asset = ? ORDER BY time_start',
+                (series, asset)).fetchall()
+
+    def __store(self, series, asset, records, covered):
+        rows = []
+        for record in records:
+            timestamp = record_time(record)
+            if timestamp is not None:
+                rows.append((series, asset, timestamp, json.dumps(record)))
+        with self.__lock, self.__db:
+            self.__db.executemany(
+                'INSERT OR REPLACE INTO points VALUES (?, ?, ?, ?)', rows)
+            ranges = self.__db.execute(
+                'SELECT time_start, time_end FROM coverage'
+                ' WHERE series = ? AND asset = ?',
+                (series, asset)).fetchall()
+            # Merge the new ranges with the overlapping or adjacent ones.
+            merged = []
+            for start, end in sorted(ranges + covered):
+                if merged and start <= merged[-1][1]:
+                    merged[-1][1] = max(merged[-1][1], end)
+                else:
+                    merged.append([start, end])
+            self.__db.execute(
+                'DELETE FROM coverage WHERE series = ? AND asset = ?',
+                (series, asset))
+            self.__db.executemany(
+                'INSERT INTO coverage VALUES (?, ?, ?, ?)',
+                [(series, asset, start, end) for start, end in merged])
+
+    def query(self, method, time_start, time_end, id=None,
+              interval='daily', **kwargs):
+        """
+          Stored records of a series between `time_start` and `time_end`
+          (included), sorted by time, without any API call.
+        """
+        series = self.series_key(method, interval, kwargs)
+        with self.__lock:
+            rows = self.__db.execute(
+                'SELECT record FROM points WHERE series = ? AND asset = ?'
+                ' AND time >= ? AND time <= ? ORDER BY time',
+                (series, '' if id is None else str(id),
+                 to_timestamp(time_start), to_timestamp(time_end)))
+            return [loads(row[0]) for row in rows]
+
+    def get(self, method, time_start, time_end, id=None, interval='daily',
+            **kwargs):
+        """
+          Records of a series between `time_start` and `time_end`, sorted by
+          time. The gaps of the stored ranges are fetched first with the
+          CoinMarketCapAPI instance of the store. `id` is the asset id of the
+          cryptocurrency endpoints. Other keyword arguments are passed to
+          each call.
+        """
+        start = to_timestamp(time_start)
+        end = to_timestamp(time_end)
+        asset = '' if id is None else str(id)
+        series = self.series_key(method, interval, kwargs)
+        gaps = subtract_ranges(start, end, self.coverage(series, asset))
+        if gaps:
+            if self.cmc is None:
+                raise ValueError('No CoinMarketCapAPI instance to fetch {}'
+                                 .format(gaps))
+            if method in PAGED_METHODS:
+                self.__fetch_pages(method, series, gaps, kwargs)
+            else:
+                for gap in gaps:
+                    self.__fetch_range(method, series, asset, gap, interval,
+                                       kwargs)
+        return self.query(method, start, end, id, interval, **kwargs)
+
+    def columns(self, method, time_start, time_end, id=None,
+                interval='daily', fields=None, **kwargs):
+        """
+          Same as `get()`, returned as columns (see
+          `coinmarketcapapi.columnar.to_columns()`).
+        """
+        return to_columns(self.get(method, time_start, time_end, id,
+                                   interval, **kwargs), fields)
+
+    def __closed_until(self, end, interval):
+        # The current interval is still open: do not record it as covered.
+        return min(end, int(time.time()) - interval_seconds(interval))
+
+    def __fetch_range(self, method, series, asset, gap, interval, params):
+        span = interval_seconds(interval) * MAX_POINTS
+        if asset:
+            params = dict(params, id=asset)
+        start, end = gap
+        while start < end:
+            window_end = min(start + span, end)
+            rep = getattr(self.cmc, method)(
+                time_start=start, time_end=window_end, interval=interval,
+                **params)
+            records = []
+            for quotes in series_records(rep.data).values():
+                records.extend(quotes)
+            closed = self.__closed_until(window_end, interval)
+            self.__store(series, asset, records,
+                         [(start, closed)] if closed > start else [])
+            start = window_end
+
+    def __fetch_pages(self, method, series, gaps, params):
+        # Pages are newest first: walk back until the oldest gap is reached.
+        oldest = gaps[0][0]
+        for rep in iter_pages(self.cmc, method, **params):
+            records = page_records(rep.data)
+            self.__store(series, '', records, [])
+            times = [record_time(record) for record in records]
+            if not times or min(times) <= oldest:
+                break
+        covered = []
+        for start, end in gaps:
+            end = self.__closed_until(end, 'daily')
+            if end > start:
+                covered.append((start, end))
+        self.__store(series, '', [], covered)
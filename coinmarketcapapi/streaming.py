@@ -0,0 +1,320 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# MIT License
+#
+# Copyright (c) 2019-2025 Remi SARRAZIN
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import codecs
+import json
+
+CHUNK_SIZE = 65536
+_WHITESPACE = ' \t\n\r'
+_NUMBER_CHARS = '0123456789.eE+-'
+_JSON_DECODE_ERROR = '999 [LOCAL_JSON_DECODE_ERROR]'
+
+
+class _Reader(object):
+    """
+        Incremental JSON reader over an iterator of byte chunks: values are
+        decoded one by one, the consumed text is dropped.
+    """
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.json = json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def more(self):
+        if self.eof:
+            return False
+        self.buffer = self.buffer[self.pos:]
+        self.pos = 0
+        for chunk in self.chunks:
+            if chunk:
+                self.buffer += self.decoder.decode(chunk)
+                return True
+        self.buffer += self.decoder.decode(b'', True)
+        self.eof = True
+        return False
+
+    def peek(self):
+        """
+          Next non-whitespace character (not consumed), None at the end.
+        """
+        while True:
+            while self.pos < len(self.buffer) and \
+                    self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.more():
+                return None
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError('Expecting {} at {}'.format(
+                repr(char), repr(self.buffer[self.pos:self.pos + 20])))
+        self.pos += 1
+
+    def grow(self):
+        """
+          Read until the unconsumed text doubles (or the end): decoding a
+          large value again after each chunk would be quadratic.
+        """
+        size = len(self.buffer) - self.pos
+        if not self.more():
+            return False
+        while len(self.buffer) < 2 * size and self.more():
+            pass
+        return True
+
+    def value(self):
+        """
+          Decode the next JSON value.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self.json.raw_decode(self.buffer, self.pos)
+            except ValueError:
+                if self.grow():
+                    continue
+                raise
+            # A number at the end of the buffer may be truncated.
+            if isinstance(value, (int, float)) and \
+                    not self.buffer[end:end + 3].lstrip(_NUMBER_CHARS) and \
+                    self.more():
+                continue
+            self.pos = end
+            return value
+
+    def members(self):
+        """
+          Iterate over the keys of the object starting here, the caller
+          consumes each value.
+        """
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(':')
+            yield key
+            if self.peek() == ',':
+                self.pos += 1
+            else:
+                self.expect('}')
+                return
+
+    def elements(self):
+        """
+          Iterate over the values of the array starting here.
+        """
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == ',':
+                self.pos += 1
+            else:
+                self.expect(']')
+                return
+
+
+def iter_payload(chunks, on_status=None, meta=None, members=None):
+    """
+      Parse an API payload from an iterator of byte chunks, yielding the
+      records of `data` as they are decoded: the elements of `data` if it
+      is an array, otherwise the elements of its arrays (eg.
+      `market_pairs`) and its object values (eg. assets keyed by id). The
+      `status` object is passed to `on_status` as soon as it is decoded,
+      the scalar members of `data` are stored in the `meta` dict, and the
+      other top-level members (eg. `message`, `error` and `statusCode` of
+      gateway errors) in the `members` dict.
+    """
+    reader = _Reader(chunks)
+    for key in reader.members():
+        if key == 'status':
+            status = reader.value()
+            if on_status is not None:
+                on_status(status)
+        elif key != 'data':
+            value = reader.value()
+            if members is not None:
+                members[key] = value
+        elif reader.peek() == '[':
+            for record in reader.elements():
+                yield record
+        elif reader.peek() == '{':
+            for name in reader.members():
+                char = reader.peek()
+                if char == '[':
+                    for record in reader.elements():
+                        yield record
+                elif char == '{':
+                    yield reader.value()
+                else:
+                    value = reader.value()
+                    if meta is not None:
+                        meta[name] = value
+        else:
+            reader.value()
+
+
+class StreamingResponse(object):
+    """
+        StreamingResponse
+
+        Response of a request sent with `stream=True`: the body is read and
+        parsed incrementally while iterating over `records()`, so the whole
+        payload is never held in memory and the first records are available
+        before the end of the download (see `iter_payload()`).
+
+        The status properties (`status`, `credit_count`, `error`...) only
+        read the beginning of the body, the API sending `status` first.
+        Scalar members of `data` (eg. the asset of market pairs) are in
+        `meta` once read. Records can be iterated over only once.
+    """
+
+    def __init__(self, resp, timer, chunk_size=CHUNK_SIZE):
+        self._req = resp
+        self.status_code = resp.status_code
+        self.attempts = 1
+        self.retry_wait = 0.
+        self.meta = {}
+        self.__members = {}
+        self.__status = None
+        self.__pending = []
+        self.__time_snap = timer.elapsed
+        self.__records = iter_payload(
+            resp.iter_content(chunk_size), self.__set_status, self.meta,
+            self.__members)
+
+    def __set_status(self, status):
+        self.__status = status
+
+    def __parse_status(self):
+        """
+          Read the body until `status` is decoded. Records read meanwhile
+          (if `data` comes first) are kept for `records()`.
+        """
+        try:
+            while self.__status is None:
+                self.__pending.append(next(self.__records))
+        except StopIteration:
+            pass
+        except ValueError:
+            self.__status = {
+                'error_code': _JSON_DECODE_ERROR,
+                'error_message': 'Local error, expecting a valid JSON',
+            }
+        if self.__status is None:
+            # Errors without `status` (as handled by Response.status).
+            members = self.__members
+            if members.get('message') and members.get('error') and \
+                    members.get('statusCode'):
+                self.__status = {
+                    'error_code': members['statusCode'],
+                    'error_message': members['message'],
+                }
+            else:
+                self.__status = {}
+
+    @property
+    def status(self):
+        if self.__status is None:
+            self.__parse_status()
+        return self.__status
+
+    def records(self):
+        """
+          Iterate over the records of `data`, decoded as they are read.
+        """
+        self.status
+        while self.__pending:
+            yield self.__pending.pop(0)
+        try:
+            for record in self.__records:
+                yield record
+        finally:
+            self._req.close()
+
+    def __iter__(self):
+        return self.records()
+
+    @property
+    def timesamp(self):
+        return self.status.get('timestamp', None)
+
+    @property
+    def error_code(self):
+        return self.status.get('error_code', None)
+
+    @property
+    def error_message(self):
+        return self.status.get('error_message', None)
+
+    @property
+    def error(self):
+        return True if self.error_code and self.error_message else False
+
+    @property
+    def ok(self):
+        return not self.error
+
+    @property
+    def elapsed(self):
+        return self.status.get('elapsed', None)
+
+    @property
+    def credit_count(self):
+        return self.status.get('credit_count', None)
+
+    @property
+    def total_elapsed(self):
+        """
+          Time to the response headers (the body is read afterwards).
+        """
+        return self.__time_snap
+
+    def close(self):
+        """
+          Release the connection without reading the rest of the body.
+        """
+        self._req.close()
+
+    def __repr__(self):
+        if self.error:
+            status = 'ERR {} "{}"'.format(self.error_code, self.error_message)
+        else:
+            status = 'OK'
+        return 'STREAMING RESPONSE: {:.0f}ms {}'.format(
+            self.__time_snap*1000, status)
+
+    def __str__(self):
+        return self.__repr__()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# MIT License
+#
+# Copyright (c) 2019-2025 Remi SARRAZIN
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import calendar
+import re
+from datetime import datetime, timezone
+
+# Interval names accepted by the historical endpoints, in seconds.
+INTERVALS = {
+    'hourly': 3600,
+    'daily': 86400,
+    'weekly': 7 * 86400,
+    'monthly': 30 * 86400,
+    'yearly': 365 * 86400,
+}
+_INTERVAL_RE = re.compile(r'^(\d+)([mhd])$')
+_UNITS = {'m': 60, 'h': 3600, 'd': 86400}
+
+
+def interval_seconds(interval):
+    """
+      Length in seconds of an API interval ('daily', '5m', '1h', '7d', ...).
+    """
+    if interval in INTERVALS:
+        return INTERVALS[interval]
+    match = _INTERVAL_RE.match(interval)
+    if match is None:
+        raise ValueError('Unknown interval {}'.format(repr(interval)))
+    return int(match.group(1)) * _UNITS[match.group(2)]
+
+
+def to_timestamp(value):
+    """
+      Convert an API timestamp ('2019-04-06T16:03:04.000Z'), a datetime
+      (naive ones are UTC) or a number into an int unix timestamp.
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            return calendar.timegm(value.timetuple())
+        return int(value.timestamp())
+    if value.isdigit():
+        return int(value)
+    # Fast path for the UTC timestamps returned by the API.
+    tail = value[19:]
+    if len(value) >= 19 and value[4] == '-' and value[10] in 'T ' and \
+            (tail in ('', 'Z') or (tail[:1] == '.' and tail[-1:] == 'Z')):
+        return calendar.timegm((
+            int(value[0:4]), int(value[5:7]), int(value[8:10]),
+            int(value[11:13]), int(value[14:16]), int(value[17:19]), 0, 0, 0))
+    date = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return int(date.timestamp())
@@ -0,0 +1,427 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# MIT License
+#
+# Copyright (c) 2019-2025 Remi SARRAZIN
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import asyncio
+import datetime
+import hashlib
+import importlib
+import json
+import os
+import threading
+import time
+import zipfile
+
+from requests import Session
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError, Timeout, TooManyRedirects
+from requests.models import Response as HTTPResponse
+from requests.structures import CaseInsensitiveDict
+
+from .cache import normalize_params
+
+# Imported by HTTPXTransport only (see `_import()`), so importing the
+# package does not load httpx.
+httpx = None
+
+# Response headers kept in recordings.
+RECORDED_HEADERS = ('Content-Type', 'Retry-After')
+
+
+def build_http_response(status_code, content, headers=None, url=None,
+                        reason=None, encoding=None):
+    """
+      Build a `requests.Response` from raw HTTP data, so responses not
+      fetched by `requests` can be wrapped in a `Response` as usual.
+    """
+    response = HTTPResponse()
+    response.status_code = status_code
+    response._content = content
+    response.headers = CaseInsensitiveDict(headers or {})
+    response.url = url
+    response.reason = reason
+    response.encoding = encoding or 'utf-8'
+    # The body is already read: `iter_content()` iterates over it.
+    response._content_consumed = True
+    return response
+
+
+def request_key(url, params):
+    """
+      Normalized key of a request, independent of the parameters order.
+    """
+    key = repr((url, normalize_params(params)))
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+class BaseTransport(object):
+    """
+        BaseTransport
+
+        HTTP layer of CoinMarketCapAPI (see the `transport` keyword argument).
+        Subclasses implement `send()`, returning a `requests.Response` (see
+        `build_http_response()`) or raising `requests` exceptions. `params`
+        are the normalized (name, value) pairs built by the client (see
+        `cache.normalize_params()`), to send as they are. With
+        `stream=True`, the body may be left unread until `iter_content()`.
+    """
+
+    def send(self, url, params, headers=None, timeout=None, stream=False):
+        raise NotImplementedError
+
+    async def asend(self, url, params, headers=None, timeout=None):
+        """
+          Used by AsyncCoinMarketCapAPI: `send()` in the default executor.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, lambda: self.send(url, params, headers, timeout))
+
+    def close(self):
+        pass
+
+
+class RequestsTransport(BaseTransport):
+    """
+        RequestsTransport
+
+        Default transport, a `requests` Session (one per thread if
+        `thread_safe`) over a connection pool shared by all the sessions.
+    """
+
+    def __init__(self, headers=None, pool_connections=10, pool_maxsize=10,
+                 pool_block=False, thread_safe=False):
+        self.headers = headers or {}
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+            pool_block=pool_block)
+        self.thread_safe = thread_safe
+        self.__local = threading.local()
+        self.__session = self.__new_session()
+
+    def __new_session(self):
+        session = Session()
+        session.mount('https://', self.adapter)
+        session.mount('http://', self.adapter)
+        session.headers.update(self.headers)
+        return session
+
+    @property
+    def session(self):
+        if not self.thread_safe:
+            return self.__session
+        # Thread-safe mode: one Session (cookies...) per thread, all of them
+        # sharing the same (thread-safe) connection pool.
+        session = getattr(self.__local, 'session', None)
+        if session is None:
+            session = self.__local.session = self.__new_session()
+        return session
+
+    def send(self, url, params, headers=None, timeout=None, stream=False):
+        return self.session.get(url, params=params, headers=headers,
+                                timeout=timeout, stream=stream)
+
+    def close(self):
+        self.adapter.close()
+
+
+def _import(*names):
+    """
+      The first of the `names` modules that can be imported, or None.
+    """
+    for name in names:
+        try:
+            return importlib.import_module(name)
+        except ImportError:
+            pass
+    return None
+
+
+def accept_encoding():
+    """
+      `Accept-Encoding` header of HTTPXTransport: the available encodings,
+      best compression first (zstd and brotli need `zstandard` and `brotli`).
+    """
+    encodings = []
+    if _import('zstandard') is not None:
+        encodings.append('zstd')
+    if _import('brotli', 'brotlicffi') is not None:
+        encodings.append('br')
+    return ', '.join(encodings + ['gzip', 'deflate'])
+
+
+class _HTTPXRaw(object):
+    """
+        Unread body of a streamed httpx response, as `requests.Response.raw`.
+    """
+
+    def __init__(self, response):
+        self.response = response
+
+    def stream(self, chunk_size, decode_content=True):
+        try:
+            for chunk in self.response.iter_bytes(chunk_size):
+                yield chunk
+        finally:
+            self.response.close()
+
+    def close(self):
+        self.response.close()
+
+    release_conn = close
+
+
+class HTTPXTransport(BaseTransport):
+    """
+        HTTPXTransport
+
+        Transport using `httpx` (install via `pip install
+        python-coinmarketcap[http2]`): HTTP/2 if `h2` is installed, so
+        concurrent requests are multiplexed over a single connection to the
+        API host, and the best available compression (see
+        `accept_encoding()`), brotli and zstd payloads being much smaller
+        than gzip ones. The same client is shared by all threads.
+
+        `max_connections` and `max_keepalive_connections` bound the
+        connection pool (HTTP/1.1 uses one connection per concurrent
+        request).
+    """
+
+    def __init__(self, headers=None, http2=True, max_connections=10,
+                 max_keepalive_connections=10):
+        global httpx
+        httpx = _import('httpx')
+        if httpx is None:
+            raise ImportError(
+                'HTTPXTransport requires `httpx`'
+                ' (install via `pip install python-coinmarketcap[http2]`).')
+        self.headers = dict(headers or {})
+        self.accept_encoding = accept_encoding()
+        self.http2 = http2 and _import('h2') is not None
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections)
+        self.client = httpx.Client(http2=self.http2, limits=self.limits)
+        self.__async_client = None
+
+    def __headers(self, headers):
+        headers = dict(self.headers, **(headers or {}))
+        headers['Accept-Encoding'] = self.accept_encoding
+        # Connections are managed by the pool (and forbidden in HTTP/2).
+        headers.pop('Connection', None)
+        return headers
+
+    @staticmethod
+    def __timeout(timeout):
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return httpx.Timeout(read, connect=connect)
+        return httpx.Timeout(timeout)
+
+    @staticmethod
+    def __response(response, content=None):
+        http_response = build_http_response(
+            response.status_code, content, dict(response.headers),
+            str(response.url), response.reason_phrase, response.encoding)
+        if content is None:
+            http_response.raw = _HTTPXRaw(response)
+            http_response._content = False
+            http_response._content_consumed = False
+        return http_response
+
+    def send(self, url, params, headers=None, timeout=None, stream=False):
+        request = self.client.build_request(
+            'GET', url, params=params, headers=self.__headers(headers),
+            timeout=self.__timeout(timeout))
+        try:
+            sent = time.perf_counter()
+            response = self.client.send(request, stream=True)
+            # Time to the response headers, as measured by `requests`.
+            elapsed = datetime.timedelta(seconds=time.perf_counter() - sent)
+            if stream:
+                http_response = self.__response(response)
+            else:
+                try:
+                    http_response = self.__response(response, response.read())
+                finally:
+                    response.close()
+        except httpx.TimeoutException as e:
+            raise Timeout(e) from e
+        except httpx.TooManyRedirects as e:
+            raise TooManyRedirects(e) from e
+        except httpx.TransportError as e:
+            raise ConnectionError(e) from e
+        http_response.elapsed = elapsed
+        return http_response
+
+    async def asend(self, url, params, headers=None, timeout=None):
+        if self.__async_client is None:
+            self.__async_client = httpx.AsyncClient(
+                http2=self.http2, limits=self.limits)
+        client = self.__async_client
+        request = client.build_request(
+            'GET', url, params=params, headers=self.__headers(headers),
+            timeout=self.__timeout(timeout))
+        try:
+            sent = time.perf_counter()
+            response = await client.send(request, stream=True)
+            # Time to the response headers, as in `send()`.
+            elapsed = datetime.timedelta(seconds=time.perf_counter() - sent)
+            try:
+                http_response = self.__response(
+                    response, await response.aread())
+            finally:
+                await response.aclose()
+        except httpx.TimeoutException as e:
+            raise Timeout(e) from e
+        except httpx.TooManyRedirects as e:
+            raise TooManyRedirects(e) from e
+        except httpx.TransportError as e:
+            raise ConnectionError(e) from e
+        http_response.elapsed = elapsed
+        return http_response
+
+    def close(self):
+        self.client.close()
+
+    async def aclose(self):
+        """
+          Close the client used by `asend()`.
+        """
+        if self.__async_client is not None:
+            await self.__async_client.aclose()
+            self.__async_client = None
+
+
+class RecordingTransport(BaseTransport):
+    """
+        RecordingTransport
+
+        Send requests with `transport` (default RequestsTransport) and append
+        each response to the `path` recording, a zip file (deflate
+        compressed) with one member per response, named by the normalized
+        request key and the occurrence number of the request.
+    """
+
+    def __init__(self, path, transport=None):
+        self.path = path
+        self.transport = transport or RequestsTransport()
+        self.__lock = threading.Lock()
+        self.__counts = {}
+        if os.path.exists(path):
+            with zipfile.ZipFile(path) as archive:
+                for name in archive.namelist():
+                    key = name.split('/')[0]
+                    self.__counts[key] = self.__counts.get(key, 0) + 1
+
+    def record(self, url, params, response):
+        key = request_key(url, params)
+        meta = {
+            'url': url,
+            'params': dict(normalize_params(params)),
+            'status_code': response.status_code,
+            'reason': response.reason,
+            'headers': dict((name, response.headers[name])
+                            for name in RECORDED_HEADERS
+                            if name in response.headers),
+        }
+        entry = json.dumps(meta).encode('utf-8') + b'\n' + response.content
+        with self.__lock:
+            count = self.__counts.get(key, 0)
+            self.__counts[key] = count + 1
+            with zipfile.ZipFile(self.path, 'a', zipfile.ZIP_DEFLATED) as z:
+                z.writestr('{}/{}'.format(key, count), entry)
+
+    def send(self, url, params, headers=None, timeout=None, stream=False):
+        # The body is read to be recorded, whatever `stream`.
+        response = self.transport.send(url, params, headers, timeout)
+        self.record(url, params, response)
+        return response
+
+    async def asend(self, url, params, headers=None, timeout=None):
+        response = await self.transport.asend(url, params, headers, timeout)
+        self.record(url, params, response)
+        return response
+
+    def close(self):
+        self.transport.close()
+
+
+class ReplayMissError(LookupError):
+    """
+        ReplayMissError
+
+        Raised by ReplayTransport for a request missing from the recording.
+    """
+
+
+class ReplayTransport(BaseTransport):
+    """
+        ReplayTransport
+
+        Serve the responses of a RecordingTransport recording from memory,
+        without network. The responses recorded for a request are replayed
+        in order, the last one being repeated once they are exhausted. A
+        request missing from the recording raises a ReplayMissError.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.__lock = threading.Lock()
+        self.__responses = {}
+        self.__positions = {}
+        with zipfile.ZipFile(path) as archive:
+            names = sorted(archive.namelist(), key=lambda name: (
+                name.split('/')[0], int(name.split('/')[1])))
+            for name in names:
+                meta, content = archive.read(name).split(b'\n', 1)
+                self.__responses.setdefault(name.split('/')[0], []).append(
+                    (json.loads(meta), content))
+
+    def __len__(self):
+        return sum(len(responses) for responses in self.__responses.values())
+
+    def send(self, url, params, headers=None, timeout=None, stream=False):
+        key = request_key(url, params)
+        responses = self.__responses.get(key, None)
+        if not responses:
+            raise ReplayMissError('No recorded response for {} {}'.format(
+                url, dict(normalize_params(params))))
+        with self.__lock:
+            position = self.__positions.get(key, 0)
+            self.__positions[key] = position + 1
+        meta, content = responses[min(position, len(responses) - 1)]
+        return build_http_response(
+            meta['status_code'], content, meta['headers'], url,
+            meta['reason'])
+
+    async def asend(self, url, params, headers=None, timeout=None):
+        return self.send(url, params, headers, timeout)
+
+    def rewind(self):
+        """
+          Replay the recorded responses from the start again.
+        """
+        with self.__lock:
+            self.__positions.clear()
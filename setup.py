@@ -19,6 +19,12 @@ setuptools.setup(
     install_requires=[
         "requests>=2.2.0"
     ],
+    extras_require={
+        "async": ["aiohttp>=3.7"],
+        "http2": ["httpx[http2,brotli,zstd]>=0.27"],
+        "numpy": ["numpy"],
+        "orjson": ["orjson"],
+    },
     license="MIT",
     classifiers=[
         "Programming Language :: Python :: 3",
@@ -49,6 +49,21 @@ WRAPPER_METHODS = [
     "fearandgreed_latest",
     "fearandgreed_historical",
 ]
+HELPER_MEMBERS = [
+    # Not endpoints: internal hooks and helpers of CoinMarketCapAPI.
+    "_prepare_request",
+    "_handle_response",
+    "_handle_network_error",
+    "_rate_limit_error",
+    "_retry_delay",
+    "_reserve_key",
+    "_revalidate",
+    "rate_limiter",
+    "key_pool",
+    "metrics",
+    "transport",
+    "gather",
+]
 KNOWN_TESTS_500 = [
     # v3 endpoints in sandbox returns 500 on Jan. 2025
     "fearandgreed_latest",
@@ -75,7 +90,7 @@ def exitOnFailed(_test, msg="Last test failed."):
 def check_members(cmc_instance):
 
     _objectBaseMeth = dir(object()) + ['__dict__', '__module__', '__weakref__']
-    _cmcKnownMembers = ['__base_url', '__debug', '__get', '__headers', '__key', '__logger', '__sandbox', '__session', '__version']
+    _cmcKnownMembers = ['__base_url', '__cache', '__cache_ttl', '__debug', '__get', '__headers', '__keep_raw', '__key', '__key_headers', '__key_pool', '__key_request_headers', '__logger', '__max_stale', '__metrics', '__rate_limiter', '__retry', '__revalidate_error', '__revalidated', '__revalidator', '__sandbox', '__send', '__single_flight', '__timeout', '__transport', '__version']
     _cmcKnownMembers = [f"_{cmc_instance.__class__.__name__}{km}" for km in _cmcKnownMembers]
     unknownMembers = []
 
@@ -83,8 +98,9 @@ def check_members(cmc_instance):
         known_member = (_mb in _cmcKnownMembers)
         base_member = (_mb in _objectBaseMeth)
         tested_member = (_mb in WRAPPER_METHODS)
+        helper_member = (_mb in HELPER_MEMBERS)
 
-        if any([known_member, base_member, tested_member]):
+        if any([known_member, base_member, tested_member, helper_member]):
             continue
         else:
             _debug(f"Error: Unknown or undefined test method for '{_mb}' in CoinMarketCapAPI instance.")
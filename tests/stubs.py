@@ -0,0 +1,83 @@
+"""
+Transport stubs shared by the offline tests: requests are answered from
+memory and recorded, without network.
+"""
+import json
+import threading
+import time
+
+from requests import Request
+
+from coinmarketcapapi.transport import BaseTransport, build_http_response
+
+STATUS = {'timestamp': '2024-01-01T00:00:00.000Z', 'error_code': 0,
+          'error_message': None, 'elapsed': 10, 'credit_count': 1}
+
+
+def http_response(payload, status_code=200, headers=None):
+    """
+      `requests.Response` of a payload (bytes, or JSON encoded).
+    """
+    body = payload if isinstance(payload, bytes) else \
+        json.dumps(payload).encode('utf-8')
+    return build_http_response(status_code, body, headers)
+
+
+def api_error(error_code, message):
+    """
+      Payload of an API error.
+    """
+    return {'status': dict(STATUS, error_code=error_code,
+                           error_message=message)}
+
+
+class ScriptedTransport(BaseTransport):
+    """
+        Answer the requests with `responses` in order, the last one being
+        repeated: (payload, status_code, headers) tuples, or callables
+        taking the request headers and returning such a tuple. Requests are
+        recorded in `requests` as (url, params, stream), and their headers
+        in `headers`. Each answer takes `delay` seconds. As with `requests`,
+        responses hold the prepared request in `request`.
+    """
+
+    def __init__(self, responses, delay=0):
+        self.responses = list(responses)
+        self.delay = delay
+        self.requests = []
+        self.headers = []
+        self.__lock = threading.Lock()
+
+    def send(self, url, params, headers=None, timeout=None, stream=False):
+        with self.__lock:
+            position = len(self.requests)
+            self.requests.append((url, params, stream))
+            self.headers.append(headers)
+        if self.delay:
+            time.sleep(self.delay)
+        response = self.responses[min(position, len(self.responses) - 1)]
+        if callable(response):
+            response = response(headers)
+        payload, status_code, response_headers = response
+        http = http_response(payload, status_code, response_headers)
+        http.url = url
+        http.request = Request('GET', url, params=params,
+                               headers=headers).prepare()
+        return http
+
+    @property
+    def keys(self):
+        """
+          API keys of the recorded requests.
+        """
+        return [headers['X-CMC_PRO_API_KEY'] for headers in self.headers]
+
+
+class StaticTransport(ScriptedTransport):
+    """
+        Answer every request with the same payload.
+    """
+
+    def __init__(self, payload, status_code=200, headers=None, delay=0):
+        super(StaticTransport, self).__init__(
+            [(payload, status_code, headers)], delay)
@@ -0,0 +1,319 @@
+"""
+Offline tests of the response cache and of its keys.
+
+    python -m unittest discover tests
+"""
+import asyncio
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from urllib.parse import urlencode
+
+from coinmarketcapapi import CoinMarketCapAPI, CoinMarketCapAPIError, \
+    MemoryCache, DiskCache
+from coinmarketcapapi.aio import aiohttp, AsyncCoinMarketCapAPI
+from coinmarketcapapi.cache import Revalidator, endpoint_ttl, make_key, \
+    normalize_params, query_string
+from coinmarketcapapi.transport import request_key
+
+from stubs import STATUS, ScriptedTransport, StaticTransport
+
+BASE_URL = 'http://stand-in/'
+DATA = {'1': {'id': 1, 'quote': {'USD': {'price': 2.5}}}}
+NEW_DATA = {'1': {'id': 1, 'quote': {'USD': {'price': 3.5}}}}
+QUOTES_KEY = make_key(BASE_URL, 'v2', '/cryptocurrency/quotes/latest',
+                      {'id': 1})
+
+
+def payload(data=DATA, timestamp=STATUS['timestamp']):
+    return {'status': dict(STATUS, timestamp=timestamp), 'data': data}
+
+
+class CacheKeyTest(unittest.TestCase):
+
+    def test_normalize_params(self):
+        expected = (('aux', 'a,b'), ('convert', 'USD'), ('id', '1'),
+                    ('skip', 'true'))
+        for params in (
+                {'id': 1, 'convert': 'USD', 'aux': ['a', 'b'], 'skip': True},
+                {'skip': 'true', 'aux': 'a,b', 'id': '1', 'convert': 'USD',
+                 'limit': None},
+                [('aux', ('a', 'b')), ('skip', True), ('id', 1),
+                 ('convert', 'USD')]):
+            self.assertEqual(normalize_params(params), expected)
+        # Idempotent: clients send the normalized pairs.
+        self.assertEqual(normalize_params(expected), expected)
+        self.assertEqual(normalize_params({'skip': False}),
+                         (('skip', 'false'),))
+
+    def test_query_string(self):
+        self.assertEqual(query_string({'convert': 'USD,EUR', 'aux': True}),
+                         'aux=true&convert=USD%2CEUR')
+
+    def test_key_matches_wire(self):
+        transport = StaticTransport(payload())
+        cmc = CoinMarketCapAPI('key', base_url=BASE_URL, transport=transport)
+        kwargs = {'convert': ['USD', 'EUR'], 'id': 1, 'aux': True}
+        cmc.cryptocurrency_quotes_latest(**kwargs)
+        url, params, _ = transport.requests[0]
+        self.assertEqual(url, BASE_URL + 'v2/cryptocurrency/quotes/latest')
+        # The cache key is made of the parameters sent, as sent.
+        key = make_key(BASE_URL, 'v2', '/cryptocurrency/quotes/latest',
+                       kwargs)
+        self.assertEqual(key[3], params)
+        self.assertEqual(urlencode(params), query_string(kwargs))
+        self.assertEqual(urlencode(params), 'aux=true&convert=USD%2CEUR&id=1')
+        self.assertEqual(request_key(url, params), request_key(url, kwargs))
+
+    def test_endpoint_ttl(self):
+        self.assertEqual(endpoint_ttl('/cryptocurrency/map'), 3600)
+        self.assertEqual(endpoint_ttl('/cryptocurrency/quotes/latest'), 60)
+        self.assertEqual(endpoint_ttl('/key/info'), 0)
+        self.assertEqual(endpoint_ttl('/cryptocurrency/quotes/latest',
+                                      {'/latest': 5}), 5)
+        self.assertEqual(endpoint_ttl('/cryptocurrency/map',
+                                      {'/cryptocurrency/map': 10}), 10)
+
+
+class ClientCacheTest(unittest.TestCase):
+
+    def test_equivalent_calls_share_entry(self):
+        transport = StaticTransport(payload())
+        cmc = CoinMarketCapAPI('key', base_url=BASE_URL, transport=transport,
+                               cache=True)
+        rep = cmc.cryptocurrency_quotes_latest(id=[1, 2], convert='USD')
+        self.assertIs(cmc.cryptocurrency_quotes_latest(
+            convert='USD', id='1,2'), rep)
+        cmc.cryptocurrency_quotes_latest(id='1,2', convert='EUR')
+        # Not cached.
+        cmc.key_info()
+        cmc.key_info()
+        self.assertEqual(len(transport.requests), 4)
+
+    def test_errors_not_cached(self):
+        transport = ScriptedTransport([
+            ({'status': dict(STATUS, error_code=500,
+                             error_message='Internal error.')}, 500, None),
+            (payload(), 200, None)])
+        cmc = CoinMarketCapAPI('key', transport=transport, cache=True)
+        with self.assertRaises(CoinMarketCapAPIError):
+            cmc.cryptocurrency_quotes_latest(id=1)
+        self.assertEqual(cmc.cryptocurrency_quotes_latest(id=1).data, DATA)
+
+
+class MemoryCacheTest(unittest.TestCase):
+
+    def test_lru(self):
+        cache = MemoryCache(maxsize=2)
+        cache.set('a', 1, 60)
+        cache.set('b', 2, 60)
+        cache.get('a')
+        cache.set('c', 3, 60)
+        self.assertEqual((cache.get('a'), cache.get('b'), cache.get('c')),
+                         (1, None, 3))
+
+    def test_expiry(self):
+        cache = MemoryCache()
+        cache.set('a', 1, -1, stale=60)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get_stale('a'), (1, False))
+        cache.set('b', 2, -1)
+        self.assertEqual(cache.get_stale('b'), (None, False))
+        self.assertEqual(len(cache), 1)
+
+
+class DiskCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def files(self):
+        return [os.path.join(self.directory, name)
+                for name in os.listdir(self.directory)]
+
+    def test_shared_between_clients(self):
+        transport = StaticTransport(payload())
+        for _ in range(2):
+            cmc = CoinMarketCapAPI('SECRET-KEY', base_url=BASE_URL,
+                                   transport=transport,
+                                   cache=DiskCache(self.directory))
+            rep = cmc.cryptocurrency_quotes_latest(id=1)
+            self.assertEqual(rep.data, DATA)
+            self.assertEqual(rep.credit_count, 1)
+        self.assertEqual(len(transport.requests), 1)
+        self.assertIsNone(rep._req)
+
+    def test_plain_data_only(self):
+        cmc = CoinMarketCapAPI('SECRET-KEY', base_url=BASE_URL,
+                               transport=StaticTransport(payload()),
+                               cache=DiskCache(self.directory))
+        cmc.cryptocurrency_quotes_latest(id=1)
+        for path in self.files():
+            with open(path, 'rb') as fd:
+                content = fd.read()
+            self.assertNotIn(b'SECRET-KEY', content)
+            self.assertNotIn(b'X-CMC_PRO_API_KEY', content)
+
+    def test_decoded_response(self):
+        cache = DiskCache(self.directory)
+        cmc = CoinMarketCapAPI('key', transport=StaticTransport(payload()))
+        rep = cmc.cryptocurrency_quotes_latest(id=1)
+        rep.data
+        self.assertIsNone(rep.content)
+        cache.set('key', rep, 60)
+        self.assertEqual(cache.get('key').data, DATA)
+
+    def test_expiry_and_invalid_files(self):
+        cache = DiskCache(self.directory, maxsize=2)
+        cmc = CoinMarketCapAPI('key', transport=StaticTransport(payload()))
+        rep = cmc.cryptocurrency_quotes_latest(id=1)
+        cache.set('a', rep, -1, stale=60)
+        self.assertIsNone(cache.get('a'))
+        stale, fresh = cache.get_stale('a')
+        self.assertEqual((stale.data, fresh), (DATA, False))
+        for key in ('b', 'c'):
+            time.sleep(.01)
+            cache.set(key, rep, 60)
+        # Least recently used entry evicted.
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get_stale('a'), (None, False))
+        for path in self.files():
+            with open(path, 'wb') as fd:
+                fd.write(b'\x80\x04garbage')
+        self.assertIsNone(cache.get('b'))
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError('Timed out')
+        time.sleep(.01)
+
+
+class RevalidatorTest(unittest.TestCase):
+
+    def test_one_refresh_per_key(self):
+        errors = []
+        revalidator = Revalidator(lambda key, error: errors.append(key))
+        release = threading.Event()
+        calls = []
+
+        def refresh():
+            calls.append(None)
+            release.wait()
+            raise ValueError('failed')
+
+        self.assertTrue(revalidator.spawn('a', refresh))
+        self.assertFalse(revalidator.spawn('a', refresh))
+        self.assertTrue(revalidator.spawn('b', refresh))
+        release.set()
+        wait_for(lambda: len(revalidator) == 0)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(sorted(errors), ['a', 'b'])
+        self.assertTrue(revalidator.spawn('a', lambda: None))
+
+
+class StaleWhileRevalidateTest(unittest.TestCase):
+
+    def client(self, responses, cache=None, delay=0):
+        self.cache = cache or MemoryCache()
+        self.transport = ScriptedTransport(
+            [(response, 200, None) for response in responses], delay)
+        return CoinMarketCapAPI('key', base_url=BASE_URL, cache=self.cache,
+                                max_stale=60, metrics=True,
+                                transport=self.transport)
+
+    def expire(self, rep):
+        self.cache.set(QUOTES_KEY, rep, -1, 60)
+
+    def revalidations(self, cmc):
+        return cmc.metrics.snapshot()['counters'].get(
+            'revalidations', {}).get('/cryptocurrency/quotes/latest', {})
+
+    def test_stale_then_refreshed(self):
+        cmc = self.client([payload(), payload(NEW_DATA)], delay=.05)
+        rep = cmc.cryptocurrency_quotes_latest(id=1)
+        self.expire(rep)
+        # The stale entry is returned at once, while a single request
+        # refreshes it in the background.
+        self.assertIs(cmc.cryptocurrency_quotes_latest(id=1), rep)
+        self.assertIs(cmc.cryptocurrency_quotes_latest(id=1), rep)
+        wait_for(lambda: self.cache.get(QUOTES_KEY) is not None)
+        fresh = cmc.cryptocurrency_quotes_latest(id=1)
+        self.assertEqual(fresh.data, NEW_DATA)
+        self.assertIs(cmc.cryptocurrency_quotes_latest(id=1), fresh)
+        self.assertEqual(len(self.transport.requests), 2)
+        self.assertEqual(self.revalidations(cmc), {'changed': 1})
+
+    def test_unchanged_data(self):
+        cmc = self.client([
+            payload(), payload(timestamp='2024-01-01T00:01:00.000Z')])
+        rep = cmc.cryptocurrency_quotes_latest(id=1)
+        rep.data
+        self.expire(rep)
+        self.assertIs(cmc.cryptocurrency_quotes_latest(id=1), rep)
+        wait_for(lambda: self.cache.get(QUOTES_KEY) is not None)
+        # Same data: the stale (already decoded) Response is kept.
+        self.assertIs(cmc.cryptocurrency_quotes_latest(id=1), rep)
+        self.assertEqual(self.revalidations(cmc), {'unchanged': 1})
+
+    def test_refresh_error(self):
+        cmc = self.client([payload()])
+        self.transport.responses.append(
+            ({'status': dict(STATUS, error_code=500,
+                             error_message='Internal error.')}, 500, None))
+        rep = cmc.cryptocurrency_quotes_latest(id=1)
+        self.expire(rep)
+        self.assertIs(cmc.cryptocurrency_quotes_latest(id=1), rep)
+        wait_for(lambda: self.revalidations(cmc))
+        self.assertEqual(self.revalidations(cmc), {'error': 1})
+        # Still stale: served again and refreshed again.
+        self.assertIs(cmc.cryptocurrency_quotes_latest(id=1), rep)
+
+    def test_beyond_max_stale(self):
+        cmc = self.client([payload(), payload(NEW_DATA)])
+        rep = cmc.cryptocurrency_quotes_latest(id=1)
+        self.cache.set(QUOTES_KEY, rep, -61, 60)
+        self.assertEqual(cmc.cryptocurrency_quotes_latest(id=1).data,
+                         NEW_DATA)
+        self.assertEqual(self.revalidations(cmc), {})
+
+    def test_disk_cache(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        cmc = self.client([payload(), payload(NEW_DATA)],
+                          DiskCache(directory))
+        self.expire(cmc.cryptocurrency_quotes_latest(id=1))
+        self.assertEqual(cmc.cryptocurrency_quotes_latest(id=1).data, DATA)
+        wait_for(lambda: self.cache.get(QUOTES_KEY) is not None)
+        self.assertEqual(cmc.cryptocurrency_quotes_latest(id=1).data,
+                         NEW_DATA)
+
+    @unittest.skipIf(aiohttp is None, 'aiohttp is not installed')
+    def test_async_client(self):
+        self.client([payload(), payload(NEW_DATA)])
+
+        async def main():
+            async with AsyncCoinMarketCapAPI(
+                    'key', base_url=BASE_URL, cache=self.cache, max_stale=60,
+                    transport=self.transport) as cmc:
+                rep = await cmc.cryptocurrency_quotes_latest(id=1)
+                self.expire(rep)
+                self.assertIs(await cmc.cryptocurrency_quotes_latest(id=1),
+                              rep)
+                while self.cache.get(QUOTES_KEY) is None:
+                    await asyncio.sleep(.01)
+                return await cmc.cryptocurrency_quotes_latest(id=1)
+
+        self.assertEqual(asyncio.run(main()).data, NEW_DATA)
+
+
+if __name__ == '__main__':
+    unittest.main()
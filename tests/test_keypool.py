@@ -0,0 +1,126 @@
+"""
+Offline tests of the API key pool.
+
+    python -m unittest discover tests
+"""
+import unittest
+
+from coinmarketcapapi import CoinMarketCapAPI, CoinMarketCapAPIError, \
+    KeyPool, RateLimitError
+from coinmarketcapapi.keypool import UNAUTHORIZED_BENCH_TIME
+
+from stubs import STATUS, ScriptedTransport, api_error
+
+OK = ({'status': STATUS, 'data': {}}, 200, None)
+THROTTLED = (api_error(1008, 'Rate limit exceeded.'), 429,
+             {'Retry-After': '120'})
+UNAUTHORIZED = (api_error(1001, 'This API Key is invalid.'), 401, None)
+
+
+def answer(by_key):
+    """
+      Scripted answer by API key, OK for the keys missing from `by_key`.
+    """
+    return lambda headers: by_key.get(headers['X-CMC_PRO_API_KEY'], OK)
+
+
+class KeyPoolTest(unittest.TestCase):
+
+    def test_requires_keys(self):
+        with self.assertRaises(ValueError):
+            KeyPool([])
+
+    def test_balance(self):
+        pool = KeyPool(['k1', 'k2'], requests_per_minute=2, max_wait=0)
+        keys = [pool.reserve()[0] for _ in range(4)]
+        self.assertEqual(sorted(keys), ['k1', 'k1', 'k2', 'k2'])
+        # Every key spent its requests of the minute.
+        self.assertIsNone(pool.reserve())
+
+    def test_most_credits_left(self):
+        pool = KeyPool(['k1', 'k2'], daily_credits=100)
+        pool.record('k1', 60)
+        self.assertEqual(pool.reserve(), ('k2', 0.))
+        self.assertEqual(pool.stats()[0]['credits_left'], 40)
+
+    def test_bench(self):
+        for max_wait in (10, None):
+            pool = KeyPool(['k1', 'k2'], max_wait=max_wait)
+            pool.throttled('k1', 30)
+            pool.unauthorized('k2')
+            benched = [stats['benched'] for stats in pool.stats()]
+            self.assertAlmostEqual(benched[0], 30, delta=1)
+            self.assertAlmostEqual(benched[1], UNAUTHORIZED_BENCH_TIME,
+                                   delta=1)
+            if max_wait is None:
+                # Wait for the end of the shortest bench.
+                key, wait = pool.reserve()
+                self.assertEqual(key, 'k1')
+                self.assertAlmostEqual(wait, 30, delta=1)
+            else:
+                # The shortest bench is longer than `max_wait`.
+                self.assertIsNone(pool.reserve())
+
+
+class ClientKeyPoolTest(unittest.TestCase):
+
+    def test_benched_on_429(self):
+        transport = ScriptedTransport([answer({'k1': THROTTLED})])
+        pool = KeyPool(['k1', 'k2'])
+        cmc = CoinMarketCapAPI(pool, transport=transport)
+        rep = cmc.globalmetrics_quotes_latest()
+        self.assertEqual(rep.attempts, 2)
+        cmc.globalmetrics_quotes_latest()
+        # The request is sent again with the other key, which is then used
+        # while the first one is benched for the Retry-After delay.
+        self.assertEqual(transport.keys, ['k1', 'k2', 'k2'])
+        self.assertAlmostEqual(pool.stats()[0]['benched'], 120, delta=1)
+
+    def test_benched_on_401(self):
+        transport = ScriptedTransport([answer({'k1': UNAUTHORIZED})])
+        pool = KeyPool(['k1', 'k2'])
+        cmc = CoinMarketCapAPI(pool, transport=transport)
+        cmc.globalmetrics_quotes_latest()
+        self.assertEqual(transport.keys, ['k1', 'k2'])
+        self.assertGreater(pool.stats()[0]['benched'], 3000)
+
+    def test_all_keys_benched(self):
+        transport = ScriptedTransport([THROTTLED])
+        pool = KeyPool(['k1', 'k2'], max_wait=1)
+        cmc = CoinMarketCapAPI(pool, transport=transport)
+        with self.assertRaises(CoinMarketCapAPIError) as context:
+            cmc.globalmetrics_quotes_latest()
+        self.assertEqual(context.exception.rep.status_code, 429)
+        self.assertEqual(transport.keys, ['k1', 'k2'])
+        # No key before `max_wait`: shed without sending.
+        with self.assertRaises(RateLimitError):
+            cmc.globalmetrics_quotes_latest()
+        self.assertEqual(len(transport.requests), 2)
+
+    def test_pinned_key(self):
+        transport = ScriptedTransport([OK])
+        cmc = CoinMarketCapAPI(['k1', 'k2'], transport=transport)
+        cmc.globalmetrics_quotes_latest(api_key='k3')
+        cmc.key_info(api_key='k2')
+        self.assertEqual(transport.keys, ['k3', 'k2'])
+
+    def test_refresh(self):
+        def key_info(headers):
+            key = headers['X-CMC_PRO_API_KEY']
+            if key == 'k2':
+                return UNAUTHORIZED
+            return ({'status': STATUS, 'data': {
+                'plan': {'credit_limit_daily': 100},
+                'usage': {'current_day': {'credits_used': 30}},
+            }}, 200, None)
+
+        pool = KeyPool(['k1', 'k2'])
+        cmc = CoinMarketCapAPI(pool, transport=ScriptedTransport([key_info]))
+        pool.refresh(cmc)
+        stats = pool.stats()
+        self.assertEqual(stats[0]['credits_left'], 70)
+        self.assertGreater(stats[1]['benched'], 3000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+"""
+Offline tests of ProcessPipeline inputs.
+
+    python -m unittest discover tests
+"""
+import json
+import unittest
+
+from coinmarketcapapi import CoinMarketCapAPI, CoinMarketCapAPIError
+from coinmarketcapapi.pipeline import ProcessPipeline
+
+from stubs import STATUS, StaticTransport
+
+RECORDS = [{'id': 1, 'quote': {'USD': {'price': 2.5}}},
+           {'id': 2, 'quote': {'USD': {'price': 0.5}}}]
+
+
+class ProcessPipelineTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cmc = CoinMarketCapAPI('key', transport=StaticTransport(
+            {'status': STATUS, 'data': RECORDS}))
+        self.pipeline = ProcessPipeline(max_workers=1,
+                                        fields=['id', 'quote.USD.price'])
+
+    def tearDown(self):
+        self.pipeline.close()
+
+    def test_responses_and_bytes(self):
+        rep = self.cmc.cryptocurrency_listings_latest()
+        body = json.dumps({'data': RECORDS}).encode()
+        for columns in self.pipeline.map([rep, body]):
+            self.assertEqual(list(columns['id']), [1, 2])
+            self.assertEqual(list(columns['quote.USD.price']), [2.5, 0.5])
+
+    def test_rejects_other_inputs(self):
+        stream = self.cmc.cryptocurrency_listings_latest(stream=True)
+        for rep in (CoinMarketCapAPIError('failed'), stream, None):
+            with self.assertRaises(TypeError):
+                self.pipeline.submit(rep)
+        stream.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
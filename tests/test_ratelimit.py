@@ -0,0 +1,114 @@
+"""
+Offline tests of the client-side rate limiter.
+
+    python -m unittest discover tests
+"""
+import unittest
+
+from coinmarketcapapi import CoinMarketCapAPI, CoinMarketCapAPIError, \
+    RateLimiter, RateLimitError
+from coinmarketcapapi.ratelimit import parse_retry_after
+
+from stubs import STATUS, StaticTransport, api_error
+
+
+class RateLimiterTest(unittest.TestCase):
+
+    def test_token_bucket(self):
+        limiter = RateLimiter(requests_per_minute=2, max_wait=0)
+        self.assertEqual(limiter.reserve(), 0)
+        self.assertEqual(limiter.reserve(), 0)
+        # The bucket is empty: the next token is 30 seconds away.
+        self.assertAlmostEqual(limiter.estimate(), 30, delta=.1)
+        self.assertIsNone(limiter.reserve())
+        self.assertFalse(limiter.acquire())
+
+    def test_wait_within_max_wait(self):
+        limiter = RateLimiter(requests_per_minute=60, max_wait=2)
+        for _ in range(60):
+            limiter.reserve()
+        wait = limiter.reserve()
+        self.assertGreater(wait, .9)
+        self.assertLessEqual(wait, 1)
+
+    def test_credit_budgets(self):
+        for kwargs in ({'daily_credits': 10}, {'monthly_credits': 10}):
+            limiter = RateLimiter(requests_per_minute=None, **kwargs)
+            limiter.record(8)
+            self.assertEqual(limiter.credits_left, 2)
+            self.assertEqual(limiter.reserve(credits=2), 0)
+            self.assertIsNone(limiter.reserve(credits=3))
+            limiter.record(2)
+            self.assertIsNone(limiter.reserve())
+
+    def test_throttled(self):
+        limiter = RateLimiter(requests_per_minute=60, max_wait=None)
+        limiter.throttled(retry_after=10)
+        self.assertAlmostEqual(limiter.estimate(), 10, delta=.1)
+        self.assertEqual(limiter.headroom, 0)
+
+    def test_from_key_info(self):
+        transport = StaticTransport({'status': STATUS, 'data': {
+            'plan': {'rate_limit_minute': 5, 'credit_limit_daily': 100,
+                     'credit_limit_monthly': 1000},
+            'usage': {'current_minute': {'requests_left': 1},
+                      'current_day': {'credits_used': 40},
+                      'current_month': {'credits_used': 400}},
+        }})
+        cmc = CoinMarketCapAPI('key', transport=transport)
+        limiter = RateLimiter.from_key_info(cmc.key_info(), max_wait=0)
+        self.assertEqual(limiter.requests_per_minute, 5)
+        self.assertEqual(limiter.credits_used, (40, 400))
+        self.assertEqual(limiter.credits_left, 60)
+        self.assertEqual(limiter.reserve(), 0)
+        self.assertIsNone(limiter.reserve())
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after('12'), 12)
+        self.assertEqual(parse_retry_after('-3'), 0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after('soon'))
+        self.assertEqual(parse_retry_after(
+            'Wed, 21 Oct 2015 07:28:00 GMT'), 0)
+
+
+class ClientRateLimitTest(unittest.TestCase):
+
+    def test_shed_without_request(self):
+        transport = StaticTransport({'status': STATUS, 'data': {}})
+        cmc = CoinMarketCapAPI('key', transport=transport, rate_limit=(
+            RateLimiter(requests_per_minute=1, max_wait=0)))
+        cmc.globalmetrics_quotes_latest()
+        with self.assertRaises(RateLimitError) as context:
+            cmc.globalmetrics_quotes_latest()
+        self.assertIsNone(context.exception.rep)
+        self.assertEqual(len(transport.requests), 1)
+
+    def test_credits_recorded(self):
+        status = dict(STATUS, credit_count=4)
+        limiter = RateLimiter(requests_per_minute=None, daily_credits=6)
+        cmc = CoinMarketCapAPI('key', rate_limit=limiter, transport=(
+            StaticTransport({'status': status, 'data': {}})))
+        cmc.cryptocurrency_listings_latest()
+        self.assertEqual(limiter.credits_left, 2)
+        # Budget check before sending: 1 credit expected, 4 used.
+        cmc.cryptocurrency_listings_latest()
+        with self.assertRaises(RateLimitError):
+            cmc.cryptocurrency_listings_latest()
+
+    def test_throttled_by_429(self):
+        limiter = RateLimiter(requests_per_minute=60, max_wait=0)
+        transport = StaticTransport(
+            api_error(1008, 'Rate limit exceeded.'), 429,
+            {'Retry-After': '30'})
+        cmc = CoinMarketCapAPI('key', rate_limit=limiter, transport=transport)
+        with self.assertRaises(CoinMarketCapAPIError):
+            cmc.globalmetrics_quotes_latest()
+        # Further requests are shed instead of piling up 429 errors.
+        with self.assertRaises(RateLimitError):
+            cmc.globalmetrics_quotes_latest()
+        self.assertEqual(len(transport.requests), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
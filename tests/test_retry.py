@@ -0,0 +1,124 @@
+"""
+Offline tests of the retry policy and of retried requests.
+
+    python -m unittest discover tests
+"""
+import unittest
+
+from requests.exceptions import ConnectionError
+
+from coinmarketcapapi import CoinMarketCapAPI, CoinMarketCapAPIError, \
+    RetryPolicy
+
+from stubs import STATUS, ScriptedTransport, StaticTransport, api_error
+
+OK = ({'status': STATUS, 'data': {'ok': True}}, 200, None)
+UNAVAILABLE = (api_error(500, 'Service unavailable.'), 503, None)
+
+
+class RetryPolicyTest(unittest.TestCase):
+
+    def test_gives_up(self):
+        policy = RetryPolicy(max_attempts=3, base_delay=.1, max_delay=1)
+        self.assertIsNotNone(policy.next_delay('/latest', 1, status_code=503))
+        self.assertIsNotNone(policy.next_delay('/latest', 2, status_code=503))
+        self.assertIsNone(policy.next_delay('/latest', 3, status_code=503))
+        # Not retryable.
+        self.assertIsNone(policy.next_delay('/latest', 1, status_code=400))
+        self.assertIsNone(RetryPolicy(retry_network_errors=False).next_delay(
+            '/latest', 1, error=ConnectionError()))
+        self.assertIsNone(RetryPolicy(non_idempotent=['/key/info'])
+                          .next_delay('/key/info', 1, status_code=503))
+
+    def test_max_total_wait(self):
+        policy = RetryPolicy(max_attempts=10, base_delay=1, max_delay=1,
+                             max_total_wait=2.5)
+        self.assertEqual(policy.next_delay('/latest', 1, None, 0., 503), 1)
+        self.assertEqual(policy.next_delay('/latest', 2, 1, 1., 503), 1)
+        self.assertIsNone(policy.next_delay('/latest', 3, 1, 2., 503))
+
+    def test_decorrelated_jitter(self):
+        policy = RetryPolicy(max_attempts=100, base_delay=1, max_delay=10)
+        delay = None
+        for attempt in range(1, 50):
+            previous = delay or 1
+            delay = policy.next_delay('/latest', attempt, delay,
+                                      status_code=503)
+            self.assertGreaterEqual(delay, 1)
+            self.assertLessEqual(delay, min(10, previous * 3))
+
+    def test_retry_after(self):
+        policy = RetryPolicy(base_delay=.1, max_delay=5)
+        for _ in range(20):
+            self.assertGreaterEqual(policy.next_delay(
+                '/latest', 1, status_code=429, retry_after=2), 2)
+        # Waiting longer than `max_delay`: give up.
+        self.assertIsNone(policy.next_delay(
+            '/latest', 1, status_code=429, retry_after=60))
+
+    def test_on_retry(self):
+        events = []
+        policy = RetryPolicy(base_delay=0, max_delay=0,
+                             on_retry=events.append)
+        policy.next_delay('/latest', 1, status_code=502)
+        self.assertEqual(events, [{
+            'path': '/latest', 'attempt': 1, 'delay': 0, 'total_wait': 0,
+            'status_code': 502, 'error': None}])
+
+
+class ClientRetryTest(unittest.TestCase):
+
+    def client(self, transport, **kwargs):
+        return CoinMarketCapAPI('key', transport=transport, retry=RetryPolicy(
+            base_delay=0, max_delay=.1, **kwargs))
+
+    def test_retried_until_success(self):
+        transport = ScriptedTransport([UNAVAILABLE, UNAVAILABLE, OK])
+        rep = self.client(transport).globalmetrics_quotes_latest()
+        self.assertEqual(rep.data, {'ok': True})
+        self.assertEqual(rep.attempts, 3)
+        self.assertEqual(len(transport.requests), 3)
+
+    def test_gives_up(self):
+        transport = StaticTransport(*UNAVAILABLE)
+        cmc = self.client(transport, max_attempts=2)
+        with self.assertRaises(CoinMarketCapAPIError) as context:
+            cmc.globalmetrics_quotes_latest()
+        self.assertEqual(context.exception.rep.status_code, 503)
+        self.assertEqual(len(transport.requests), 2)
+
+    def test_network_errors(self):
+        def unreachable(headers):
+            raise ConnectionError('unreachable')
+
+        transport = ScriptedTransport([unreachable, OK])
+        rep = self.client(transport).globalmetrics_quotes_latest()
+        self.assertEqual(rep.attempts, 2)
+        transport = ScriptedTransport([unreachable])
+        with self.assertRaises(ConnectionError):
+            self.client(transport).globalmetrics_quotes_latest()
+        self.assertEqual(len(transport.requests), 3)
+
+    def test_honors_retry_after(self):
+        throttled = (api_error(1008, 'Rate limit exceeded.'), 429,
+                     {'Retry-After': '0.05'})
+        transport = ScriptedTransport([throttled, OK])
+        rep = self.client(transport).globalmetrics_quotes_latest()
+        self.assertEqual(rep.attempts, 2)
+        self.assertGreaterEqual(rep.retry_wait, .05)
+        # Retry-After beyond `max_delay`: not retried.
+        transport = ScriptedTransport([
+            throttled[:2] + ({'Retry-After': '60'},), OK])
+        with self.assertRaises(CoinMarketCapAPIError):
+            self.client(transport).globalmetrics_quotes_latest()
+        self.assertEqual(len(transport.requests), 1)
+
+    def test_non_idempotent(self):
+        transport = ScriptedTransport([UNAVAILABLE, OK])
+        with self.assertRaises(CoinMarketCapAPIError):
+            self.client(transport, non_idempotent=['/key/info']).key_info()
+        self.assertEqual(len(transport.requests), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+"""
+Offline tests of request coalescing (single-flight).
+
+    python -m unittest discover tests
+"""
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from coinmarketcapapi import CoinMarketCapAPI, CoinMarketCapAPIError, \
+    SingleFlight, AsyncSingleFlight
+from coinmarketcapapi.aio import aiohttp, AsyncCoinMarketCapAPI
+
+from stubs import STATUS, ScriptedTransport, StaticTransport, api_error
+
+# Time for the followers to join the call in flight.
+JOIN_DELAY = .1
+
+
+class SingleFlightTest(unittest.TestCase):
+
+    def run_concurrently(self, function, callers=4):
+        """
+          Call `function` through a SingleFlight from `callers` threads,
+          the first call blocking until the others joined it. Returns the
+          results (or exceptions) and the number of calls made.
+        """
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def call():
+            calls.append(None)
+            release.wait()
+            return function()
+
+        def do():
+            try:
+                return flight.do('key', call)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(callers) as executor:
+            futures = [executor.submit(do) for _ in range(callers)]
+            time.sleep(JOIN_DELAY)
+            release.set()
+            results = [future.result() for future in futures]
+        self.assertEqual(len(flight), 0)
+        return results, len(calls)
+
+    def test_shared_result(self):
+        results, calls = self.run_concurrently(object)
+        self.assertEqual(calls, 1)
+        self.assertTrue(all(result is results[0] for result in results))
+
+    def test_shared_exception(self):
+        def fail():
+            raise ValueError('failed')
+
+        results, calls = self.run_concurrently(fail)
+        self.assertEqual(calls, 1)
+        self.assertIsInstance(results[0], ValueError)
+        self.assertTrue(all(result is results[0] for result in results))
+
+    def test_sequential_calls(self):
+        flight = SingleFlight()
+        self.assertEqual(flight.do('key', lambda: 1), 1)
+        self.assertEqual(flight.do('key', lambda: 2), 2)
+
+    def test_async(self):
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def call():
+            calls.append(None)
+            await asyncio.sleep(JOIN_DELAY)
+            return object()
+
+        async def main():
+            return await asyncio.gather(
+                *[flight.do('key', call) for _ in range(4)])
+
+        results = asyncio.run(main())
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(result is results[0] for result in results))
+
+
+class ClientCoalesceTest(unittest.TestCase):
+
+    def gather(self, cmc, calls):
+        with ThreadPoolExecutor(len(calls)) as executor:
+            futures = [executor.submit(lambda c: c[0](**c[1]), call)
+                       for call in calls]
+            results = []
+            for future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    results.append(e)
+            return results
+
+    def test_identical_calls(self):
+        transport = StaticTransport({'status': STATUS, 'data': {}},
+                                    delay=JOIN_DELAY)
+        cmc = CoinMarketCapAPI('key', transport=transport, coalesce=True)
+        # Same parameters, in any order or form.
+        reps = self.gather(cmc, [
+            (cmc.cryptocurrency_quotes_latest, {'id': '1,2', 'aux': 'a'}),
+            (cmc.cryptocurrency_quotes_latest, {'aux': 'a', 'id': [1, 2]}),
+            (cmc.cryptocurrency_quotes_latest, {'id': (1, 2), 'aux': 'a'}),
+        ])
+        self.assertEqual(len(transport.requests), 1)
+        self.assertTrue(all(rep is reps[0] for rep in reps))
+
+    def test_shared_error(self):
+        transport = StaticTransport(api_error(500, 'Internal error.'), 500,
+                                    delay=JOIN_DELAY)
+        cmc = CoinMarketCapAPI('key', transport=transport, coalesce=True)
+        errors = self.gather(cmc, [(cmc.key_info, {})] * 3)
+        self.assertEqual(len(transport.requests), 1)
+        self.assertIsInstance(errors[0], CoinMarketCapAPIError)
+        self.assertTrue(all(error is errors[0] for error in errors))
+
+    def test_pinned_keys(self):
+        def key_data(headers):
+            return ({'status': STATUS, 'data': {
+                'key': headers['X-CMC_PRO_API_KEY']}}, 200, None)
+
+        transport = ScriptedTransport([key_data], delay=JOIN_DELAY)
+        cmc = CoinMarketCapAPI('k0', transport=transport, coalesce=True)
+        reps = self.gather(cmc, [
+            (cmc.key_info, {'api_key': 'k1'}),
+            (cmc.key_info, {'api_key': 'k2'}),
+            (cmc.key_info, {'api_key': 'k1'}),
+        ])
+        self.assertEqual([rep.data['key'] for rep in reps], ['k1', 'k2', 'k1'])
+        self.assertEqual(sorted(transport.keys), ['k1', 'k2'])
+
+    @unittest.skipIf(aiohttp is None, 'aiohttp is not installed')
+    def test_async_client(self):
+        transport = StaticTransport({'status': STATUS, 'data': {}},
+                                    delay=JOIN_DELAY)
+
+        async def main():
+            async with AsyncCoinMarketCapAPI(
+                    'key', transport=transport, coalesce=True) as cmc:
+                return await asyncio.gather(
+                    cmc.globalmetrics_quotes_latest(),
+                    cmc.globalmetrics_quotes_latest(),
+                    cmc.globalmetrics_quotes_latest(api_key='k1'))
+
+        reps = asyncio.run(main())
+        self.assertIs(reps[0], reps[1])
+        self.assertIsNot(reps[0], reps[2])
+        self.assertEqual(len(transport.requests), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+"""
+Offline tests of the streaming JSON parser and of `stream=True` requests.
+
+    python -m unittest discover tests
+"""
+import json
+import unittest
+
+from coinmarketcapapi import CoinMarketCapAPI, CoinMarketCapAPIError, \
+    APITimer
+from coinmarketcapapi.streaming import StreamingResponse, iter_payload
+
+from stubs import StaticTransport, http_response
+
+RECORDS = [
+    {'id': 1, 'name': 'Bitcoin', 'price': 43210.123456789,
+     'volume': -1.5e-07, 'supply': 19600000, 'big': 12345678901234567890,
+     'tags': ['mineable', 'pow'], 'platform': None, 'active': True},
+    {'id': 2, 'name': 'quote "escaped" \\ back\\slash\n\ttab é',
+     'symbol': '€\U0001f600漢', 'zero': 0, 'exp': 3E+10,
+     'flag': False, 'nested': {'a': [1, 2, {'b': 'c'}], 'e': {}}},
+    12345,
+    -0.5,
+    'string',
+    None,
+]
+STATUS = {'timestamp': '2024-01-01T00:00:00.000Z', 'error_code': 0,
+          'error_message': None, 'elapsed': 10, 'credit_count': 2}
+
+
+def chunked(body, size):
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+class IterPayloadTest(unittest.TestCase):
+
+    def parse(self, payload, size, ensure_ascii=False, indent=None):
+        body = json.dumps(payload, ensure_ascii=ensure_ascii,
+                          indent=indent).encode('utf-8')
+        statuses, meta, members = [], {}, {}
+        records = list(iter_payload(chunked(body, size), statuses.append,
+                                    meta, members))
+        return records, statuses, meta, members
+
+    def test_chunk_boundaries(self):
+        # Every chunk size up to 17 bytes splits numbers, escapes and
+        # multibyte characters at every possible position.
+        payload = {'status': STATUS, 'data': RECORDS}
+        for size in range(1, 18):
+            for ensure_ascii in (False, True):
+                for indent in (None, 2):
+                    records, statuses, _, _ = self.parse(
+                        payload, size, ensure_ascii, indent)
+                    self.assertEqual(records, RECORDS, size)
+                    self.assertEqual(statuses, [STATUS])
+
+    def test_single_chunk(self):
+        body = json.dumps({'status': STATUS, 'data': RECORDS}).encode()
+        self.assertEqual(list(iter_payload([body])), RECORDS)
+
+    def test_empty_data(self):
+        for data in ([], {}):
+            records, statuses, _, _ = self.parse(
+                {'status': STATUS, 'data': data}, 3)
+            self.assertEqual(records, [])
+            self.assertEqual(statuses, [STATUS])
+
+    def test_data_object(self):
+        payload = {'status': STATUS, 'data': {
+            'id': 1, 'symbol': 'BTC', 'num_market_pairs': 2,
+            'market_pairs': RECORDS[:2]}}
+        for size in (1, 5, 64):
+            records, _, meta, _ = self.parse(payload, size)
+            self.assertEqual(records, RECORDS[:2])
+            self.assertEqual(meta, {'id': 1, 'symbol': 'BTC',
+                                    'num_market_pairs': 2})
+
+    def test_data_keyed_by_id(self):
+        payload = {'status': STATUS, 'data': {
+            '1': RECORDS[0], 'BTC': [RECORDS[1], RECORDS[0]]}}
+        records, _, _, _ = self.parse(payload, 4)
+        self.assertEqual(records, [RECORDS[0], RECORDS[1], RECORDS[0]])
+
+    def test_data_before_status(self):
+        records, statuses, _, _ = self.parse(
+            {'data': RECORDS, 'status': STATUS}, 6)
+        self.assertEqual(records, RECORDS)
+        self.assertEqual(statuses, [STATUS])
+
+    def test_error_members(self):
+        payload = {'message': 'Forbidden é', 'error': True,
+                   'statusCode': 403}
+        for size in (1, 3, 100):
+            records, statuses, _, members = self.parse(payload, size)
+            self.assertEqual(records, [])
+            self.assertEqual(statuses, [])
+            self.assertEqual(members, payload)
+
+    def test_invalid_json(self):
+        for body in (b'<html>oops</html>', b'{"data": [1, 2',
+                     b'{"data": [1 2]}'):
+            with self.assertRaises(ValueError):
+                list(iter_payload(chunked(body, 3)))
+
+
+class StreamingResponseTest(unittest.TestCase):
+
+    def test_status_then_records(self):
+        rep = StreamingResponse(
+            http_response({'status': STATUS, 'data': RECORDS}), APITimer(),
+            chunk_size=7)
+        self.assertTrue(rep.ok)
+        self.assertEqual(rep.credit_count, 2)
+        self.assertEqual(list(rep), RECORDS)
+
+    def test_error_body_without_status(self):
+        rep = StreamingResponse(http_response(
+            {'message': 'Forbidden', 'error': True, 'statusCode': 403}, 403),
+            APITimer())
+        self.assertTrue(rep.error)
+        self.assertEqual(rep.error_code, 403)
+        self.assertEqual(rep.error_message, 'Forbidden')
+
+    def test_invalid_json(self):
+        rep = StreamingResponse(http_response(b'<html>502</html>', 502),
+                                APITimer())
+        self.assertTrue(rep.error)
+        self.assertEqual(rep.error_code, '999 [LOCAL_JSON_DECODE_ERROR]')
+
+
+class ClientStreamTest(unittest.TestCase):
+
+    def test_stream(self):
+        transport = StaticTransport({'status': STATUS, 'data': RECORDS})
+        cmc = CoinMarketCapAPI('key', transport=transport, cache=True)
+        for _ in range(2):
+            rep = cmc.cryptocurrency_listings_latest(limit=5, stream=True)
+            self.assertIsInstance(rep, StreamingResponse)
+            self.assertEqual(list(rep), RECORDS)
+        # Streamed responses are not cached.
+        self.assertEqual(len(transport.requests), 2)
+        self.assertEqual(transport.requests[0][1:], ((('limit', '5'),), True))
+
+    def test_stream_error_body(self):
+        body = {'message': 'Forbidden', 'error': True, 'statusCode': 403}
+        cmc = CoinMarketCapAPI('key', transport=StaticTransport(body, 403))
+        for stream in (False, True):
+            with self.assertRaises(CoinMarketCapAPIError) as context:
+                cmc.cryptocurrency_listings_latest(stream=stream)
+            self.assertEqual(context.exception.rep.error_code, 403)
+
+    def test_stream_api_error(self):
+        status = dict(STATUS, error_code=1002,
+                      error_message='API key missing.')
+        cmc = CoinMarketCapAPI('key', transport=StaticTransport(
+            {'status': status}, 401))
+        with self.assertRaises(CoinMarketCapAPIError) as context:
+            cmc.cryptocurrency_listings_latest(stream=True)
+        self.assertEqual(context.exception.rep.error_code, 1002)
+
+
+if __name__ == '__main__':
+    unittest.main()